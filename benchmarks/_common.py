@@ -0,0 +1,67 @@
+"""Shared helpers for benchmarks. Results are printed as JSON and optionally appended
+to JSON-lines file for compare between versions"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# benchmarks measure this checkout: works without `pip install -e .` or PYTHONPATH
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import eggella  # noqa: E402
+
+
+def subprocess_env() -> Dict[str, str]:
+    """environment for child interpreters: repository root first in PYTHONPATH"""
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summary(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "n": len(values),
+        "min": min(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def arg_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-o", "--output", help="append results to JSON-lines file")
+    return parser
+
+
+def emit(benchmark: str, results: Dict[str, Any], output: Optional[str] = None) -> Dict[str, Any]:
+    record = {
+        "benchmark": benchmark,
+        "eggella": eggella.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "timestamp": time.time(),
+        "results": results,
+    }
+    print(json.dumps(record, indent=2))
+    if output:
+        with open(output, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
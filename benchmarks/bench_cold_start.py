@@ -0,0 +1,65 @@
+"""Cold start time of one-shot `Eggella.run_argv` execution.
+
+Every run starts new python process, registers commands and executes one command.
+prompt_toolkit must not be imported on this path.
+
+USAGE:
+    python benchmarks/bench_cold_start.py --runs 20 -o bench_results.jsonl
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import arg_parser, emit, subprocess_env, summary
+
+APP_TEMPLATE = '''
+import sys
+from eggella import Eggella
+
+app = Eggella("cold_start")
+
+for i in range({commands}):
+    app.register_command(lambda a=0, b=0: a + b, "cmd-%d" % i, "command %d" % i)
+
+code = app.run_argv()
+if any(m.startswith("prompt_toolkit") for m in sys.modules):
+    print("prompt_toolkit imported", file=sys.stderr)
+    code = 255
+sys.exit(code)
+'''
+
+
+def measure(script: str, argv, runs: int):
+    env = subprocess_env()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, script, *argv], env=env, capture_output=True, text=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f"run failed ({proc.returncode}): {proc.stderr}")
+    return timings
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--commands", type=int, nargs="+", default=[10, 1000])
+    args = parser.parse_args()
+
+    results = {}
+    baseline = measure("-c", ["pass"], args.runs)
+    results["python_startup_ms"] = summary(baseline)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.commands:
+            script = os.path.join(tmp, f"app_{count}.py")
+            with open(script, "w") as f:
+                f.write(APP_TEMPLATE.format(commands=count))
+            results[f"run_argv_{count}_commands_ms"] = summary(measure(script, ["cmd-0", "1", "2"], args.runs))
+    emit("cold_start", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
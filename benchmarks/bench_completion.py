@@ -0,0 +1,126 @@
+"""Keystroke latency of completion as commands registry grows.
+
+For every registry size typed text is completed prefix by prefix, as prompt does on every keystroke:
+patched `FuzzyCompleter` over `CommandCompleter` (commands keys) and `NestedCommandCompleter` (nested tree leaves).
+Latency and allocated memory peak (tracemalloc, separate pass) are reported per keystroke.
+Prompt scenario types the line through prompt_toolkit pipe input with dummy output (input processing and rendering).
+
+USAGE:
+    python benchmarks/bench_completion.py --sizes 10 1000 10000 100000 -o bench_results.jsonl
+"""
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from _common import arg_parser, emit, summary
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+
+from eggella import Eggella
+from eggella._patches import FuzzyCompleter
+from eggella.command import RawCommandHandler
+
+
+def make_app(size: int) -> Eggella:
+    app = Eggella(f"bench-completion-{size}")
+    for i in range(size):
+        app.register_command(lambda a=0, b=0: a + b, f"cmd-{i}", f"command {i}")
+    app.command_manager.register_command(
+        lambda query: query,
+        "tree",
+        cmd_handler=RawCommandHandler(),
+        nested_completions={"table": {f"table_{i}": None for i in range(size)}, "column": {"id", "name"}},
+    )
+    app.completion_budget = None
+    app._prepare()
+    return app
+
+
+def keystrokes(line: str) -> List[str]:
+    return [line[:i] for i in range(1, len(line) + 1)]
+
+
+def complete_all(completer: FuzzyCompleter, text: str) -> int:
+    return sum(1 for _ in completer.get_completions(Document(text), CompleteEvent(text_inserted=True)))
+
+
+def measure_latency(fn: Callable[[str], int], texts: List[str], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            fn(text)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def measure_allocations(fn: Callable[[str], int], texts: List[str]) -> List[float]:
+    peaks = []
+    tracemalloc.start()
+    try:
+        for text in texts:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn(text)
+            peaks.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def measure_prompt(app: Eggella, line: str, repeat: int) -> List[float]:
+    from prompt_toolkit import PromptSession
+
+    timings = []
+    for _ in range(repeat):
+        with create_pipe_input() as pipe, create_app_session(input=pipe, output=DummyOutput()):
+            session: PromptSession = PromptSession()
+            completer = FuzzyCompleter(app.command_manager.get_completer())
+
+            def feed():
+                for char in line:
+                    pipe.send_text(char)
+                pipe.send_text("\r")
+
+            threading.Thread(target=feed, daemon=True).start()
+            start = time.perf_counter()
+            session.prompt("> ", completer=completer, complete_while_typing=True)
+            timings.append((time.perf_counter() - start) * 1000 / (len(line) + 1))
+    return timings
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for size in args.sizes:
+        app = make_app(size)
+        completer = FuzzyCompleter(app.command_manager.get_completer())
+
+        def complete(text: str) -> int:
+            return complete_all(completer, text)
+
+        scenarios = {
+            "commands": keystrokes(f"cmd-{size - 1}"),
+            "nested": keystrokes(f"tree table table_{size - 1}"),
+        }
+        for name, texts in scenarios.items():
+            # warm up derived caches: first keystroke cost is reported separately
+            start = time.perf_counter()
+            complete(texts[-1])
+            results[f"{name}_{size}_first_ms"] = {"value": (time.perf_counter() - start) * 1000}
+            results[f"{name}_{size}_keystroke_ms"] = summary(measure_latency(complete, texts, args.repeat))
+            results[f"{name}_{size}_keystroke_alloc_kib"] = summary(measure_allocations(complete, texts))
+        results[f"prompt_{size}_keystroke_ms"] = summary(measure_prompt(app, f"cmd-{size - 1} 1 2", args.repeat))
+    emit("completion", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
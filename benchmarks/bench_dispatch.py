@@ -0,0 +1,159 @@
+"""Dispatch path throughput of `CommandManager.exec`: tokenize, cast, execute and errors translation.
+
+Runs in-process without TTY. Reports commands per second and per call latency for every arguments kind,
+every error branch, FSM transitions and `help`/`.man` text render for different registry sizes.
+
+USAGE:
+    python benchmarks/bench_dispatch.py --iterations 20000 -o bench_results.jsonl
+"""
+import time
+from typing import Callable, Dict, List, Tuple, Type
+
+from _common import arg_parser, emit, summary
+
+from eggella import Eggella
+from eggella.command import RawCommandHandler
+from eggella.exceptions import (
+    CommandArgumentValueError,
+    CommandRuntimeError,
+    CommandTooManyArgumentsError,
+)
+from eggella.fsm import IntStateGroup
+from eggella.shortcuts.help_pager import _render_man_text
+
+EXPECTED_ERRORS = (CommandTooManyArgumentsError, CommandArgumentValueError, CommandRuntimeError)
+
+
+class Form(IntStateGroup):
+    NAME = 0
+    EMAIL = 1
+    DONE = 2
+
+
+def make_app() -> Eggella:
+    app = Eggella("bench-dispatch")
+
+    @app.on_command()
+    def zero():
+        return 1
+
+    @app.on_command()
+    def positional(a: int, b: int):
+        return a + b
+
+    @app.on_command()
+    def keyword(a: int = 0, b: int = 0):
+        return a + b
+
+    @app.on_command()
+    def varargs(*args: int):
+        return sum(args)
+
+    @app.on_command("list")
+    def list_(items: List[int]):
+        return len(items)
+
+    @app.on_command("dict")
+    def dict_(items: Dict[str, int]):
+        return len(items)
+
+    @app.on_command(cmd_handler=RawCommandHandler())
+    def raw(text: str):
+        return text
+
+    @app.on_command()
+    def runtime():
+        raise RuntimeError("boom")
+
+    @app.on_error(ZeroDivisionError)
+    def on_zero_division(key: str, exc: BaseException, *args, **kwargs):
+        return "handled"
+
+    @on_zero_division
+    @app.on_command()
+    def handled():
+        raise ZeroDivisionError
+
+    app.register_states(Form)
+
+    @app.on_state(Form.NAME)
+    def name():
+        app.fsm["name"] = "name"
+        app.fsm.next()
+
+    @app.on_state(Form.EMAIL)
+    def email():
+        app.fsm["email"] = "email"
+        app.fsm.next()
+
+    @app.on_state(Form.DONE)
+    def done():
+        app.fsm.finish()
+
+    app._prepare()
+    return app
+
+
+SCENARIOS: List[Tuple[str, str, str]] = [
+    ("zero_arg", "zero", ""),
+    ("positional", "positional", "1 2"),
+    ("keyword", "keyword", "a=1 b=2"),
+    ("varargs_int", "varargs", "1 2 3 4 5"),
+    ("list_int", "list", '"[1, 2, 3, 4, 5]"'),
+    ("dict_str_int", "dict", "\"{'a': 1, 'b': 2}\""),
+    ("raw_handler", "raw", "select * from table where id = 1"),
+    ("error_too_many_arguments", "zero", "1 2"),
+    ("error_missing_argument", "positional", "1"),
+    ("error_invalid_literal", "positional", "a b"),
+    ("error_runtime", "runtime", ""),
+    ("error_on_error_handler", "handled", ""),
+]
+
+
+def run(fn: Callable[[], object], iterations: int, expected: Tuple[Type[BaseException], ...] = ()) -> Dict[str, float]:
+    timings = []
+    total_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            fn()
+        except expected:
+            pass
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    elapsed = time.perf_counter() - total_start
+    result = {f"{k}_us": v for k, v in summary(timings).items() if k != "n"}
+    result["ops_per_sec"] = iterations / elapsed
+    return result
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--commands", type=int, nargs="+", default=[10, 1000])
+    args = parser.parse_args()
+
+    app = make_app()
+    manager = app.command_manager
+    results = {}
+    for name, key, arguments in SCENARIOS:
+
+        def dispatch(key=key, arguments=arguments):
+            return manager.exec(key, arguments)
+
+        results[name] = run(dispatch, args.iterations, EXPECTED_ERRORS)
+    results["fsm_3_transitions"] = run(lambda: app.fsm.run(Form), args.iterations)
+
+    for count in args.commands:
+        registry = Eggella(f"bench-dispatch-help-{count}")
+        for i in range(count):
+            registry.register_command(lambda a=0, b=0: a + b, f"cmd-{i}", f"command {i}")
+        registry._prepare()
+        iterations = max(10, args.iterations // count)
+        results[f"help_render_{count}_commands"] = run(lambda: registry.command_manager.exec("help", ""), iterations)
+        commands = registry.command_manager.commands.values()
+        results[f"man_render_{count}_commands"] = run(lambda: _render_man_text(registry, commands), iterations)
+    emit("dispatch", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
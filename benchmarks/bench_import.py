@@ -0,0 +1,81 @@
+"""Import time budget check.
+
+Measures `import eggella` and startup of application with 30 blueprints (without REPL),
+fails with exit code 1 if budget exceeded or prompt_toolkit imported before `loop()`.
+
+USAGE:
+    python benchmarks/bench_import.py --import-budget-ms 50 --startup-budget-ms 100
+"""
+import json
+import subprocess
+import sys
+
+from _common import arg_parser, emit, subprocess_env, summary
+
+STARTUP_SCRIPT = '''
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from eggella import Eggella
+
+imported = time.perf_counter()
+app = Eggella("main")
+for i in range({blueprints}):
+    bp = Eggella("bp-%d" % i)
+    for j in range({commands}):
+        bp.register_command(lambda a=0, b=0: a + b, "bp%d-cmd%d" % (i, j), "command %d" % j)
+    app.register_blueprint(bp)
+app._prepare()
+ready = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (ready - start) * 1000,
+    "prompt_toolkit": any(m.startswith("prompt_toolkit") for m in sys.modules),
+}}))
+'''
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--blueprints", type=int, default=30)
+    parser.add_argument("--commands", type=int, default=10, help="commands per blueprint")
+    parser.add_argument("--import-budget-ms", type=float, default=50)
+    parser.add_argument("--startup-budget-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    env = subprocess_env()
+    script = STARTUP_SCRIPT.format(blueprints=args.blueprints, commands=args.commands)
+    import_ms, startup_ms, prompt_toolkit_imported = [], [], False
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout)
+        import_ms.append(result["import_ms"])
+        startup_ms.append(result["startup_ms"])
+        prompt_toolkit_imported |= result["prompt_toolkit"]
+
+    results = {
+        "blueprints": args.blueprints,
+        "commands_per_blueprint": args.commands,
+        "import_ms": summary(import_ms),
+        "startup_ms": summary(startup_ms),
+        "prompt_toolkit_imported": prompt_toolkit_imported,
+    }
+    emit("import_budget", results, args.output)
+
+    errors = []
+    if results["import_ms"]["p50"] > args.import_budget_ms:
+        errors.append(f"`import eggella` p50 {results['import_ms']['p50']:.1f}ms > {args.import_budget_ms}ms")
+    if results["startup_ms"]["p50"] > args.startup_budget_ms:
+        errors.append(f"startup p50 {results['startup_ms']['p50']:.1f}ms > {args.startup_budget_ms}ms")
+    if prompt_toolkit_imported:
+        errors.append("prompt_toolkit imported before loop()")
+    for error in errors:
+        print("BUDGET EXCEEDED:", error, file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
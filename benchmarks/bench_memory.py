@@ -0,0 +1,72 @@
+"""Commands registry memory: bytes per registered command.
+
+Commands functions are created before measurement: only registry records, handlers, nested completions and meta,
+`help` completions built on prepare and top level completions list are measured (tracemalloc net allocations).
+
+USAGE:
+    python benchmarks/bench_memory.py --sizes 1000 10000 100000 -o bench_results.jsonl
+"""
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from _common import arg_parser, emit
+
+from eggella import Eggella
+
+
+def make_functions(size: int) -> List[Callable[..., Any]]:
+    def make(i: int):
+        def fn(a: int = 0, b: int = 0):
+            return a + b + i
+
+        fn.__doc__ = f"command {i}"
+        return fn
+
+    return [make(i) for i in range(size)]
+
+
+def traced(fn: Callable[[], Any]) -> int:
+    """net allocated bytes, kept after call"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    fn()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before
+
+
+def measure(size: int) -> Dict[str, float]:
+    functions = make_functions(size)
+    app = Eggella(f"bench-memory-{size}")
+    manager = app.command_manager
+    results = {}
+
+    def register():
+        for i, fn in enumerate(functions):
+            app.register_command(fn, f"cmd-{i}")
+
+    results["register"] = traced(register)
+    results["prepare"] = traced(app._prepare)
+    # top level completions index is cached by manager, descriptions are built only for rendered completions
+    results["completions"] = traced(lambda: manager.completion_index)
+    results["total"] = sum(results.values())
+    return {f"{name}_bytes_per_command": value / size for name, value in results.items()}
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    results = {}
+    tracemalloc.start()
+    try:
+        for size in args.sizes:
+            results[f"commands_{size}"] = measure(size)
+    finally:
+        tracemalloc.stop()
+    emit("memory", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
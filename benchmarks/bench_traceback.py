@@ -0,0 +1,62 @@
+"""Runtime error traceback render: bounded renderer vs full `traceback.format_exception` for recursion depths.
+
+USAGE:
+    python benchmarks/bench_traceback.py --depths 10 100 1000 3000 -o bench_results.jsonl
+"""
+import sys
+import time
+import traceback
+from typing import Callable, Dict, List
+
+from _common import arg_parser, emit, summary
+
+from eggella.tracebacks import TracebackRenderer
+
+
+def recursion(depth: int) -> BaseException:
+    def rec(n: int):
+        if n == 0:
+            raise ValueError("bench")
+        return rec(n - 1)
+
+    try:
+        rec(depth)
+    except ValueError as e:
+        return e
+    raise AssertionError("not raised")
+
+
+def timed(fn: Callable[[], str], repeat: int) -> Dict[str, float]:
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e6)
+    return {f"{k}_us" if k != "n" else k: v for k, v in summary(times).items()}
+
+
+def measure(depth: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    exc = recursion(depth)
+    renderer = TracebackRenderer()
+    bounded = renderer.render_text(exc)
+    full = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    return {
+        "bounded": {**timed(lambda: renderer.render_text(exc), repeat), "lines": bounded.count("\n")},
+        "full": {
+            **timed(lambda: "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)), repeat),
+            "lines": full.count("\n"),
+        },
+    }
+
+
+def main():
+    parser = arg_parser(__doc__)
+    parser.add_argument("--depths", type=int, nargs="+", default=[10, 100, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max(args.depths) + 1000))
+    emit("traceback", {f"depth_{d}": measure(d, args.repeat) for d in args.depths}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,16 @@
-from eggella.app import Eggella
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.6"
+__all__ = ["Eggella"]
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+
+
+def __getattr__(name: str):
+    # import application on first usage: `eggella.client` and others submodules stay lightweight
+    if name == "Eggella":
+        from eggella.app import Eggella
+
+        return Eggella
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
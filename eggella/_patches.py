@@ -1,10 +1,29 @@
+import heapq
 import re
-from typing import Iterable
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
 
-from prompt_toolkit.completion import CompleteEvent, Completion
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
 from prompt_toolkit.completion import FuzzyCompleter as OldFuzzyCompleter
 from prompt_toolkit.completion.fuzzy_completer import _FuzzyMatch
 from prompt_toolkit.document import Document
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
+
+
+class MoreCompletion(Completion):
+    """`more…` continuation item: Tab on it shows next page of completions"""
+
+    def __init__(self, owner: "FuzzyCompleter", page_text: str, word_before_cursor: str):
+        super().__init__(
+            word_before_cursor,
+            -len(word_before_cursor),
+            display="more…",
+            display_meta="press Tab for next page",
+            style="class:completion-menu.more",
+        )
+        self.owner = owner
+        self.page_text = page_text
 
 
 class FuzzyCompleter(OldFuzzyCompleter):
@@ -15,8 +34,29 @@ class FuzzyCompleter(OldFuzzyCompleter):
     1. tap whitespace char only
 
     2. tap whitespace char + any text
+
+    Yields only `limit` best matches per page (bounded heap selection): large candidates sets are not sorted
+    and stop consuming when page filled by best possible matches.
     """
 
+    def __init__(
+        self,
+        completer: Completer,
+        WORD: bool = False,
+        pattern: Optional[str] = None,
+        enable_fuzzy: bool = True,
+        limit: int = 100,
+    ) -> None:
+        super().__init__(completer, WORD=WORD, pattern=pattern, enable_fuzzy=enable_fuzzy)
+        self.limit = limit
+        self._page_text: Optional[str] = None
+        self._pages = 1
+
+    def request_more(self, page_text: str):
+        """show next page of completions for this document text"""
+        if page_text == self._page_text:
+            self._pages += 1
+
     def _get_fuzzy_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
         word_before_cursor = document.get_word_before_cursor(pattern=re.compile(self._get_pattern()))
 
@@ -25,37 +65,23 @@ class FuzzyCompleter(OldFuzzyCompleter):
             text=document.text[: document.cursor_position - len(word_before_cursor)],
             cursor_position=document.cursor_position - len(word_before_cursor),
         )
+        if document.text != self._page_text:
+            self._page_text, self._pages = document.text, 1
+        limit = self.limit * self._pages
 
-        inner_completions = list(self.completer.get_completions(document2, complete_event))
-
-        fuzzy_matches: list[_FuzzyMatch] = []  # type: ignore
+        inner_completions = self.completer.get_completions(document2, complete_event)
 
+        fuzzy_matches: List[_FuzzyMatch]
         if word_before_cursor == "":
             # If word before the cursor is an empty string, consider all
             # completions, without filtering everything with an empty regex
             # pattern.
-            fuzzy_matches = [_FuzzyMatch(0, 0, compl) for compl in inner_completions]
+            fuzzy_matches = [_FuzzyMatch(0, 0, compl) for compl in islice(inner_completions, limit + 1)]
         else:
-            pat = ".*?".join(map(re.escape, word_before_cursor))
-            pat = f"(?=({pat}))"  # lookahead regex to manage overlapping matches
-            regex = re.compile(pat, re.IGNORECASE)
-            for compl in inner_completions:
-                # first path
-                if compl is None:
-                    continue
-                matches = list(regex.finditer(compl.text))
-                if matches:
-                    # Prefer the match, closest to the left, then shortest.
-                    best = min(matches, key=lambda m: (m.start(), len(m.group(1))))
-                    fuzzy_matches.append(_FuzzyMatch(len(best.group(1)), best.start(), compl))
-
-            def sort_key(fuzzy_match: _FuzzyMatch) -> tuple[int, int]:  # type: ignore
-                "Sort by start position, then by the length of the match."
-                return fuzzy_match.start_pos, fuzzy_match.match_length
-
-            fuzzy_matches = sorted(fuzzy_matches, key=sort_key)
-
-        for match in fuzzy_matches:
+            fuzzy_matches = self._top_matches(inner_completions, word_before_cursor, limit + 1)
+
+        has_more = len(fuzzy_matches) > limit
+        for match in fuzzy_matches[:limit]:
             if match.completion is None:
                 # second path
                 yield Completion("")
@@ -70,3 +96,62 @@ class FuzzyCompleter(OldFuzzyCompleter):
                     display=self._get_display(match, word_before_cursor),
                     style=match.completion.style,
                 )
+        if has_more:
+            yield MoreCompletion(self, document.text, word_before_cursor)
+
+    @staticmethod
+    def _top_matches(completions: Iterable[Completion], word_before_cursor: str, n: int) -> List[_FuzzyMatch]:
+        """n best matches ordered by start position, then by the length of the match, then by completer order"""
+        pat = ".*?".join(map(re.escape, word_before_cursor))
+        pat = f"(?=({pat}))"  # lookahead regex to manage overlapping matches
+        regex = re.compile(pat, re.IGNORECASE)
+        # cheap rejection of not matched candidates before overlapping matches search
+        prefilter = re.compile(".*?".join(map(re.escape, word_before_cursor)), re.IGNORECASE).search
+        # min-heap of inverted keys: heap[0] is the worst of kept matches
+        heap: List[Tuple[int, int, int, Completion]] = []
+        best_key_count = 0
+        best_length = len(word_before_cursor)
+        for seq, compl in enumerate(completions):
+            # first path
+            if compl is None or not prefilter(compl.text):
+                continue
+            matches = list(regex.finditer(compl.text))
+            if not matches:
+                continue
+            # Prefer the match, closest to the left, then shortest.
+            best = min(matches, key=lambda m: (m.start(), len(m.group(1))))
+            start, length = best.start(), len(best.group(1))
+            item = (-start, -length, -seq, compl)
+            if len(heap) < n:
+                heapq.heappush(heap, item)
+            elif item[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, item)
+            # early cutoff: page is filled by matches, which can not be outranked
+            if start == 0 and length == best_length:
+                best_key_count += 1
+                if best_key_count >= n:
+                    break
+        heap.sort(key=lambda i: i[:3], reverse=True)
+        return [_FuzzyMatch(-length, -start, compl) for start, length, _, compl in heap]
+
+
+def more_completions_bindings() -> KeyBindings:
+    """Tab on `more…` item loads next page of completions"""
+    bindings = KeyBindings()
+
+    @Condition
+    def on_more_completion() -> bool:
+        from prompt_toolkit.application import get_app
+
+        state = get_app().current_buffer.complete_state
+        return bool(state) and isinstance(state.current_completion, MoreCompletion)  # type: ignore[union-attr]
+
+    @bindings.add("tab", filter=on_more_completion)
+    def _next_page(event: KeyPressEvent):
+        buffer = event.current_buffer
+        more: MoreCompletion = buffer.complete_state.current_completion  # type: ignore[union-attr,assignment]
+        more.owner.request_more(more.page_text)
+        buffer.cancel_completion()
+        buffer.start_completion()
+
+    return bindings
@@ -1,35 +1,39 @@
+import sys
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
-    Hashable,
+    List,
     Literal,
     Optional,
+    Tuple,
     Type,
     Union,
     overload,
 )
 
-from prompt_toolkit import HTML, PromptSession
-from prompt_toolkit.completion.nested import NestedDict
-
-from eggella._patches import FuzzyCompleter
 from eggella._types import ARGS_AND_KWARGS, LITERAL_EVENTS, PromptLikeMsg
+from eggella.cache import CachePolicy
 from eggella.command.abc import ABCCommandHandler
 from eggella.command.objects import Command
-from eggella.events.events import OnCommandRuntimeError
-from eggella.exceptions import (
-    CommandArgumentValueError,
-    CommandNotFoundError,
-    CommandParseError,
-    CommandRuntimeError,
-    CommandTooManyArgumentsError,
-)
+from eggella.context import ContextStorage
 from eggella.fsm.fsm import FsmController, IntStateGroup
-from eggella.manager import BlueprintManager, CommandManager, EventManager
+from eggella.manager import ERROR_EVENTS, BlueprintManager, CommandManager, EventManager
 from eggella.shortcuts.cmd_shortcuts import CmdShortCuts
 
-_DEFAULT_INTRO_MSG = HTML(
+if TYPE_CHECKING:
+    from prompt_toolkit import HTML, PromptSession
+    from prompt_toolkit.completion.nested import NestedDict
+
+    from eggella.audit import AuditSink
+    from eggella.blueprint import LazyBlueprint
+    from eggella.middleware import MiddlewareLike
+    from eggella.testing import EggellaTestClient
+    from eggella.trace import TraceRecorder
+    from eggella.tracebacks import TracebackLog
+
+_DEFAULT_INTRO_MSG = (
     "<ansired>Press |CTRL+C| or |CTRL+D| or type</ansired> exit <ansired>for close this app</ansired>\n"
     "<ansigreen>Press |TAB| or type</ansigreen> help <ansigreen>for get commands information</ansigreen>"
 )
@@ -49,15 +53,34 @@ class Eggella:
     def __init__(self, app_name: str, msg: PromptLikeMsg = "> "):
         self.app_name = app_name
         self.prompt_msg = msg
-        self.session: PromptSession = PromptSession(msg)
+        # created on first access: one-shot and blueprint apps never prompt
+        self._session: Optional["PromptSession"] = None
         self.cmd = CmdShortCuts()
 
         # app context storage
-        self.CTX: Dict[Hashable, Any] = {}
+        self.CTX: ContextStorage = ContextStorage()
         # config
-        self._intro: Union[HTML, PromptLikeMsg] = _DEFAULT_INTRO_MSG
+        self._intro: Union["HTML", PromptLikeMsg, None] = None
         self._doc: str = ""
         self.overwrite_commands_from_blueprints: bool = False
+        # import lazy blueprints in background thread after startup
+        self.warmup_blueprints: bool = False
+        # poll blueprints modules mtime and reload changed before next command
+        self.watch_blueprints: bool = False
+        # on-disk cache of commands signatures and docstrings for fast startup
+        self.registry_snapshot_path: Optional[str] = None
+        # run completion in background thread, nested completers are limited by this time budget (seconds).
+        # None - synchronous completion
+        self.completion_budget: Optional[float] = 0.2
+        # max completions in menu page, Tab on `more…` item shows next page
+        self.completion_page_size: int = 100
+        # `text` - styled output, `jsonl` - one JSON object per line for results and errors
+        self._output_format: Literal["text", "jsonl"] = "text"
+        # record entered commands with timings, see `enable_trace`
+        self.trace_recorder: Optional["TraceRecorder"] = None
+        # rotating file for full commands runtime errors tracebacks. Disabled if None
+        self.traceback_log: Optional["TracebackLog"] = None
+        self._is_prepared: bool = False
 
         # managers
         self._command_manager: CommandManager = CommandManager(self)
@@ -67,6 +90,28 @@ class Eggella:
         # fsm
         self.fsm = FsmController(self)
 
+    @property
+    def session(self) -> "PromptSession":
+        """Get prompt session. Created on first access"""
+        if self._session is None:
+            from prompt_toolkit import PromptSession
+
+            from eggella._patches import more_completions_bindings
+
+            self._session = PromptSession(self.prompt_msg, key_bindings=more_completions_bindings())
+        return self._session
+
+    @session.setter
+    def session(self, session: "PromptSession"):
+        """Set user prompt session. Its key bindings are merged with `more…` completions page binding"""
+        from prompt_toolkit.key_binding import merge_key_bindings
+
+        from eggella._patches import more_completions_bindings
+
+        bindings = [kb for kb in (session.key_bindings, more_completions_bindings()) if kb]
+        session.key_bindings = merge_key_bindings(bindings)
+        self._session = session
+
     @property
     def blueprint_manager(self):
         """Get blueprint manager"""
@@ -94,12 +139,28 @@ class Eggella:
     @property
     def intro(self):
         """startup intro text"""
+        if self._intro is None:
+            from prompt_toolkit import HTML
+
+            self._intro = HTML(_DEFAULT_INTRO_MSG)
         return self._intro
 
     @intro.setter
-    def intro(self, text: Union[HTML, PromptLikeMsg]):
+    def intro(self, text: Union["HTML", PromptLikeMsg]):
         self._intro = text
 
+    @property
+    def output_format(self) -> Literal["text", "jsonl"]:
+        """commands results and errors output format: `text` or `jsonl`"""
+        return self._output_format
+
+    @output_format.setter
+    def output_format(self, value: Literal["text", "jsonl"]):
+        if value not in ("text", "jsonl"):
+            raise ValueError(f"Unknown output format {value!r}, expected `text` or `jsonl`")
+        self._output_format = value
+        self._event_manager.reset_default_events()
+
     def on_startup(self):
         """Register event manager on startup app"""
         return self.event_manager.startup()
@@ -122,9 +183,10 @@ class Eggella:
         *,
         usage: Optional[str] = None,
         cmd_handler: Optional[Callable[[Callable[..., Any], str], ARGS_AND_KWARGS]] = None,
-        nested_completions: Optional[NestedDict] = None,
+        nested_completions: Optional["NestedDict"] = None,
         nested_meta: Optional[Dict[str, Any]] = None,
         is_visible: bool = True,
+        cache: Optional[CachePolicy] = None,
     ):
         """Register command
 
@@ -132,9 +194,10 @@ class Eggella:
         :param short_description: short description
         :param usage: usage example
         :param cmd_handler: Command handler
-        :param nested_completions: nested completer
+        :param nested_completions: nested completer. Callables values are cached by `CompletionProvider`
         :param nested_meta: nested meta information
         :param is_visible: set visible command
+        :param cache: memoize results of pure command by parsed arguments
         """
         return self._command_manager.command(
             key,
@@ -144,8 +207,16 @@ class Eggella:
             nested_completions=nested_completions,
             nested_meta=nested_meta,
             is_visible=is_visible,
+            cache=cache,
         )
 
+    def use(self, *middlewares: "MiddlewareLike"):
+        """Add command execution middlewares. First added middleware is outermost
+
+        :param middlewares: Middleware instances or `fn(call, call_next)` around functions
+        """
+        self._command_manager.use(*middlewares)
+
     def on_state(self, state: IntStateGroup):
         """register state handler
 
@@ -161,10 +232,11 @@ class Eggella:
         """
         self.fsm.attach(states)
 
-    def register_blueprint(self, *apps: "Eggella"):
+    def register_blueprint(self, *apps: Union["Eggella", "LazyBlueprint", str]):
         """register blueprint for extension. Add on_startup, on_close, on_command, on_state events
 
-        :param apps: Eggella applications
+        :param apps: Eggella applications or `pkg.module:attr` import strings.
+            Import strings mounted lazily on first dispatch or completion of one of its commands
         :return:
         """
         self.blueprint_manager.register_blueprints(*apps)
@@ -181,10 +253,17 @@ class Eggella:
         is_visible: bool = True,
         usage: Optional[str] = None,
         cmd_handler: Optional[ABCCommandHandler] = None,
+        cache: Optional[CachePolicy] = None,
     ):
         """Register command from function"""
         self._command_manager.register_command(
-            func, key, short_description=short_description, usage=usage, cmd_handler=cmd_handler, is_visible=is_visible
+            func,
+            key,
+            short_description=short_description,
+            usage=usage,
+            cmd_handler=cmd_handler,
+            is_visible=is_visible,
+            cache=cache,
         )
 
     @overload
@@ -226,18 +305,140 @@ class Eggella:
         """
         if self.has_command(key):
             self.command_manager.commands.pop(key)
+            # invalidate completer and cached completions
+            self.command_manager.completions_version += 1
         else:
             raise KeyError
 
-    def loop(self):
-        """Run this application"""
-        self.cmd.print_ft(self.intro)
+    def _prepare(self):
+        """load blueprints and register buildin commands once"""
+        if self._is_prepared:
+            return
         self._load_blueprints()
         self._command_manager.register_buildin_commands()
+        self._command_manager.compile_middlewares()
+        if self.registry_snapshot_path:
+            self._apply_registry_snapshot(self.registry_snapshot_path)
+        self._is_prepared = True
+
+    def _apply_registry_snapshot(self, path: str):
+        from eggella.snapshot import RegistrySnapshot
+
+        snapshot = RegistrySnapshot(path)
+        if snapshot.apply(self._command_manager):
+            return
+        # cold start: indexes are built lazily on usage, snapshot is written once on close
+        saved: List[bool] = []
+
+        def save():
+            if not saved:
+                saved.append(True)
+                snapshot.save(self._command_manager)
+
+        self.register_event("close", save)
+
+    def loop(self):
+        """Run this application"""
+        if self._output_format == "text":
+            self.cmd.print_ft(self.intro)
+        self._prepare()
         self._handle_startup_events()
+        if self.warmup_blueprints:
+            self.blueprint_manager.warm_up()
+        if self.watch_blueprints:
+            self.blueprint_manager.reloader.watch()
         self._handle_commands()
         self._handle_close_events()
 
+    def enable_metrics(self, export_path: Optional[str] = None, fmt: Literal["json", "prometheus"] = "json"):
+        """Enable commands calls, errors and latency metrics and `.stats` buildin command
+
+        :param export_path: write metrics to this file on close app
+        :param fmt: export format: `json` or `prometheus` text
+        """
+        from eggella.metrics import CommandMetrics
+
+        metrics = self.command_manager.metrics = CommandMetrics()
+        if export_path:
+            self.register_event("close", lambda: metrics.export(export_path, fmt))
+        return metrics
+
+    def enable_trace(self, path: str) -> "TraceRecorder":
+        """Record entered commands lines, phases timings and outcomes to JSONL trace file.
+        Replay it by `python -m eggella.trace APP TRACE`
+
+        :param path: trace file path. Entries are appended
+        """
+        import atexit
+
+        from eggella.trace import TraceRecorder
+
+        recorder = self.trace_recorder = TraceRecorder(path, self.app_name)
+        # entries are flushed on write, file is closed on interpreter exit: close events may run on every driver session
+        atexit.register(recorder.close)
+        return recorder
+
+    def enable_traceback_log(self, path: str, max_bytes: int = 1 << 20, backup_count: int = 3) -> "TracebackLog":
+        """Write full tracebacks of commands runtime errors to rotating file.
+        Console output keeps bounded traceback
+
+        :param path: log file path
+        :param max_bytes: rotate file after this size
+        :param backup_count: keep rotated files count
+        """
+        from eggella.tracebacks import TracebackLog
+
+        log = self.traceback_log = TracebackLog(path, max_bytes, backup_count)
+        self.register_event("close", log.close)
+        return log
+
+    def enable_audit(self, path: str, user: Optional[str] = None, **options: Any) -> "AuditSink":
+        """Write every executed command key, arguments, user, duration and outcome event to JSONL audit file.
+        Records are written by background thread, queued records are flushed on close app
+
+        :param path: audit file path. Records are appended
+        :param user: user name. Default current OS user
+        :param options: `AuditSink` queue, batching, rotation and fsync options
+        """
+        import atexit
+
+        from eggella.audit import AuditSink
+
+        sink = self.command_manager.audit = AuditSink(path, self.app_name, user, **options)
+        # writer thread is stopped on interpreter exit: close events may run on every driver session
+        atexit.register(sink.close)
+        return sink
+
+    def run_argv(self, argv: Optional[List[str]] = None) -> int:
+        """Execute one command from command line arguments without REPL and return exit code.
+        prompt_toolkit is not imported in this mode. `--jsonl` first argument switches output to JSON lines
+
+        USAGE:
+            sys.exit(app.run_argv())
+
+        :param argv: command key and arguments. Default `sys.argv[1:]`
+        """
+        from eggella.runner import run_argv
+
+        return run_argv(self, sys.argv[1:] if argv is None else argv)
+
+    def driver(self) -> "EggellaTestClient":
+        """Get headless driver for scripted sessions without terminal"""
+        from eggella.testing import EggellaTestClient
+
+        return EggellaTestClient(self)
+
+    def serve_daemon(self, socket_path: str):
+        """Run this application as warm daemon behind unix domain socket.
+
+        Send commands by thin client: `python -m eggella.client SOCKET_PATH COMMAND [ARGS ...]`
+
+        :param socket_path: unix socket path
+        """
+        from eggella.daemon import serve_daemon
+
+        serve_daemon(self, socket_path)
+
     def _handle_startup_events(self):
         for event in self._event_manager.startup_events:
             event()
@@ -245,31 +446,63 @@ class Eggella:
     def _handle_close_events(self):
         for event in self._event_manager.close_events:
             event()
+        if self.command_manager.audit is not None:
+            self.command_manager.audit.flush()
 
     def get_command(self, key: str) -> Command:
         """get command object from command_manager"""
         return self.command_manager.get(key)
 
-    def _handle_error(self, key, args, exc):
+    def _dispatch(self, key: str, args: str, timings: Optional[List[int]] = None) -> str:
+        """execute command, call result or error event
+
+        :param timings: if passed - write tokenize, cast, execute time in nanoseconds
+        :return: called event name
+        """
         try:
+            if timings is None:
+                result = self.command_manager.exec(key, args)
+            else:
+                result = self.command_manager.exec_timed(key, args, timings)
+        except Exception as exc:
+            return self._handle_error(key, args, exc)
+        # machine consumers get record for every command
+        if result or self._output_format == "jsonl":
+            self.event_manager.command_complete_event(result)
+        return "command_complete_event"
+
+    def _handle_error(self, key, args, exc) -> str:
+        """call error event
+
+        :return: called event name
+        """
+        event_name = ERROR_EVENTS.get(type(exc))
+        if event_name is None:
             raise exc
-        except CommandNotFoundError:
-            self.event_manager.command_not_found_event(key, args)
+        if self.traceback_log is not None and event_name == "command_runtime_err_event":
+            self.traceback_log.write(key, args, exc)
+        event = getattr(self.event_manager, event_name)
+        if event_name == "command_not_found_event":
+            event(key, args)
             if self.event_manager.command_suggest_event:
-                self.event_manager.command_suggest_event(
-                    key, [c.key for c in self._command_manager.commands.values() if c.is_visible]
-                )
-        except CommandRuntimeError as exc:
-            self.event_manager.command_runtime_err_event(key, args, exc)
-        except CommandParseError:
-            self.event_manager.command_error_event(key, args)
-        except CommandTooManyArgumentsError as exc:
-            self.event_manager.command_many_args_err_event(key, args, exc)
-        except CommandArgumentValueError as exc:
-            self.event_manager.command_argument_value_err_event(key, args, exc)
+                self.event_manager.command_suggest_event(key, self._command_manager.suggestion_candidates)
+        elif event_name == "command_error_event":
+            event(key, args)
+        else:
+            event(key, args, exc)
+        return event_name
+
+    @staticmethod
+    def _split_line(line: str) -> Tuple[str, str]:
+        if (tokens := line.split(" ", 1)) and len(tokens) == 1:
+            return tokens[0], ""
+        return tokens[0], tokens[1]
 
     def _handle_commands(self):
         """application loop"""
+        from eggella._patches import FuzzyCompleter
+
+        command_completer = self.command_manager.get_completer()
         while True:
             try:
                 # if FSM activated - handle this
@@ -285,18 +518,22 @@ class Eggella:
                         if self.event_manager.fsm_eof_error_event():
                             self.fsm.finish()
                 # handle main app input
-                completer = FuzzyCompleter(completer=self.command_manager.get_completer())
-                result = self.session.prompt(self.prompt_msg, completer=completer)
+                completer = FuzzyCompleter(completer=command_completer, limit=self.completion_page_size)
+                result = self.session.prompt(
+                    self.prompt_msg, completer=completer, complete_in_thread=self.completion_budget is not None
+                )
                 if not result:
                     continue
 
-                if (tokens := result.split(" ", 1)) and len(tokens) == 1:
-                    key, args = tokens[0], ""
-                else:
-                    key, args = tokens[0], tokens[1]
+                key, args = self._split_line(result)
+                if self._blueprint_manager.reloader.pending:
+                    for line in self._blueprint_manager.reload():
+                        self.cmd.print_ft(f"reloaded {line}")
                 # handle input command
-                if result := self.command_manager.exec(key, args):
-                    self.event_manager.command_complete_event(result)
+                if self.trace_recorder is None:
+                    self._dispatch(key, args)
+                else:
+                    self.trace_recorder.record(self, result, key, args)
             # exit exceptions
             except KeyboardInterrupt:
                 if self.event_manager.kb_interrupt_event():
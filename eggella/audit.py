@@ -0,0 +1,257 @@
+"""Commands audit log: JSONL records written by background thread.
+
+Record: `{"ts": epoch, "app": ..., "user": ..., "key": ..., "args": ..., "duration_ns": ..., "outcome": event name}`
+"""
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from eggella.events.jsonl import ENCODER
+
+# queued record: timestamp, key, args, duration ns, outcome
+_Record = Tuple[float, str, str, int, str]
+
+
+def _current_user() -> str:
+    import getpass
+
+    try:
+        return getpass.getuser()
+    except Exception:
+        return str(os.getuid()) if hasattr(os, "getuid") else ""
+
+
+class AuditSink:
+    """Non-blocking commands audit sink. Commands put records to bounded in-memory queue,
+    background thread writes them by batches, rotates file and fsyncs it.
+
+    If disk stalls and queue is full, command waits up to `block_timeout` seconds (backpressure),
+    then record is dropped and counted in `dropped`
+
+    :param path: audit JSONL file path
+    :param app_name: application name, written to records
+    :param user: user name. Default current OS user
+    :param queue_size: max queued records
+    :param batch_size: max records per write
+    :param max_bytes: rotate file after this size. 0 - disable
+    :param rotate_interval: rotate file after this seconds. 0 - disable
+    :param backup_count: keep rotated files count: `path.1` ... `path.N`
+    :param fsync_interval: fsync written records every N seconds. 0 - after every batch, None - never
+    :param block_timeout: wait for queue free slot seconds. 0 - drop immediately
+    """
+
+    def __init__(
+        self,
+        path: str,
+        app_name: str = "",
+        user: Optional[str] = None,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 512,
+        max_bytes: int = 16 << 20,
+        rotate_interval: float = 0,
+        backup_count: int = 5,
+        fsync_interval: Optional[float] = 1.0,
+        block_timeout: float = 0.0,
+    ):
+        self.path = path
+        self.app_name = app_name
+        self.user = _current_user() if user is None else user
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.fsync_interval = fsync_interval
+        self.block_timeout = block_timeout
+        # counters
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.errors = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # None after failed reopen on rotation: reopened on next batch
+        self._file: Optional[TextIO] = self._open()
+        self._opened = time.monotonic()
+        self._synced = self._opened
+        self._dirty = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="eggella-audit", daemon=True)
+        self._thread.start()
+
+    def record(self, key: str, args: str, duration_ns: int, outcome: str):
+        """put command record to queue. Drop it, if queue is full after `block_timeout`"""
+        if self._closed:
+            return
+        item = (time.time(), key, args, duration_ns, outcome)
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """wait until queued records are written and synced to disk
+
+        :return: False if not flushed in timeout
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """flush records and stop writer thread. Stalled writer thread is left as daemon after `timeout` seconds"""
+        if self._closed:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.flush(timeout)
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=self._remaining(deadline))
+        except queue.Full:
+            return
+        self._thread.join(self._remaining(deadline))
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
+
+    def _open(self) -> TextIO:
+        return open(self.path, "a", encoding="utf-8")
+
+    def _reopen(self) -> Optional[TextIO]:
+        try:
+            self._file = self._open()
+        except OSError:
+            self.errors += 1
+            return None
+        self._opened = time.monotonic()
+        return self._file
+
+    def _encode(self, record: _Record) -> str:
+        ts, key, args, duration_ns, outcome = record
+        return ENCODER.encode(
+            {
+                "ts": round(ts, 6),
+                "app": self.app_name,
+                "user": self.user,
+                "key": key,
+                "args": args,
+                "duration_ns": duration_ns,
+                "outcome": outcome,
+            }
+        )
+
+    def _run(self):
+        while True:
+            timeout = self.fsync_interval if self._dirty and self.fsync_interval else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                continue
+            batch: List[_Record] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if waiters or stop:
+                self._sync()
+                for waiter in waiters:
+                    waiter.set()
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                return
+
+    def _write(self, batch: List[_Record]):
+        file = self._file or self._reopen()
+        if file is None:
+            with self._lock:
+                self.dropped += len(batch)
+            return
+        try:
+            file.write("".join(self._encode(record) + "\n" for record in batch))
+            file.flush()
+        except (OSError, ValueError):
+            with self._lock:
+                self.errors += 1
+                self.dropped += len(batch)
+            return
+        self.written += len(batch)
+        self.batches += 1
+        self._dirty = True
+        now = time.monotonic()
+        if self.fsync_interval is not None and now - self._synced >= self.fsync_interval:
+            self._sync()
+        if (self.max_bytes and file.tell() >= self.max_bytes) or (
+            self.rotate_interval and now - self._opened >= self.rotate_interval
+        ):
+            self._rotate()
+
+    def _sync(self):
+        if not self._dirty or self.fsync_interval is None or self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except (OSError, ValueError):
+            self.errors += 1
+            return
+        self._synced = time.monotonic()
+        self._dirty = False
+        self.fsyncs += 1
+
+    def _rotate(self):
+        self._sync()
+        try:
+            self._file.close()
+            if self.backup_count:
+                for i in range(self.backup_count - 1, 0, -1):
+                    if os.path.exists(f"{self.path}.{i}"):
+                        os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError:
+            self.errors += 1
+        self._file = None
+        if self._reopen():
+            self.rotations += 1
@@ -0,0 +1,181 @@
+import importlib
+import importlib.util
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional, Union
+
+from eggella.command.objects import Command, slotted
+from eggella.exceptions import CommandNotFoundError, CommandRuntimeError
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+
+# {command_key: short description} or {command_key: {"short_description": ..., "arguments": [...], ...}}
+Manifest = Dict[str, Union[str, Dict[str, Any]]]
+
+
+def _default_index_path(app_name: str) -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in app_name)
+    return os.path.join(cache_dir, "eggella", f"blueprints-{slug}.json")
+
+
+class BlueprintIndex:
+    """On-disk cache of lazy blueprints manifests. Entry is valid while module file is not changed"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def stamp(module_name: str) -> Optional[List[Any]]:
+        # find module file without import (parent package will be imported)
+        from eggella import __version__
+
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            return None
+        if not spec or not spec.origin or not os.path.isfile(spec.origin):
+            return None
+        st = os.stat(spec.origin)
+        return [__version__, spec.origin, st.st_mtime_ns, st.st_size]
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data  # type: ignore[return-value]
+
+    def get(self, import_path: str, module_name: str) -> Optional[Manifest]:
+        if not (entry := self.data.get(import_path)):
+            return None
+        if entry.get("stamp") != self.stamp(module_name):
+            return None
+        return entry.get("commands")
+
+    def set(self, import_path: str, module_name: str, manifest: Manifest):
+        self.data[import_path] = {"stamp": self.stamp(module_name), "commands": manifest}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # read-only cache dir: just import blueprint on next startup
+            pass
+
+
+def manifest_from_app(blueprint: "Eggella") -> Manifest:
+    """create manifest of registered commands"""
+    return {
+        key: {
+            "short_description": command.short_description,
+            "usage": command.usage,
+            "arguments": command.arguments,
+            "docstring": command.docstring,
+            "is_visible": command.is_visible,
+        }
+        for key, command in blueprint.command_manager.commands.items()
+    }
+
+
+class LazyBlueprint:
+    """Blueprint, which imported by `pkg.module:attr` string on first dispatch or completion of one of its commands
+
+    :param import_path: `pkg.module:attr` import string. If attr not passed - `app` used
+    :param manifest: commands metadata. If not passed - loaded from index cache
+    """
+
+    def __init__(self, import_path: str, manifest: Optional[Manifest] = None):
+        self.import_path = import_path
+        self.module_name, _, self.attr = import_path.partition(":")
+        self.attr = self.attr or "app"
+        self.manifest = manifest
+        self.app: Optional["Eggella"] = None
+        self._lock = threading.RLock()
+
+    @property
+    def app_name(self) -> str:
+        return self.import_path
+
+    @property
+    def is_mounted(self) -> bool:
+        return self.app is not None
+
+    def import_app(self) -> "Eggella":
+        from eggella.app import Eggella
+
+        blueprint = getattr(importlib.import_module(self.module_name), self.attr)
+        if not isinstance(blueprint, Eggella):
+            raise TypeError(f"`{self.import_path}` is not Eggella application")
+        return blueprint
+
+    def __repr__(self):
+        return f"LazyBlueprint({self.import_path!r}, mounted={self.is_mounted})"
+
+
+@slotted()
+@dataclass
+class LazyCommand(Command):
+    """Command placeholder. Metadata taken from blueprint manifest, blueprint mounted on first `resolve()`"""
+
+    blueprint: Optional[LazyBlueprint] = None
+    manifest: Dict[str, Any] = field(default_factory=dict)
+    mount: Any = None  # Callable[[LazyBlueprint], None]
+
+    is_lazy: ClassVar[bool] = True
+
+    @classmethod
+    def from_manifest(
+        cls, key: str, meta: Union[str, Dict[str, Any]], blueprint: LazyBlueprint, mount
+    ) -> "LazyCommand":
+        if isinstance(meta, str):
+            meta = {"short_description": meta}
+        return cls(
+            fn=_not_mounted,
+            key=key,
+            usage=meta.get("usage"),
+            short_description=meta.get("short_description"),
+            is_visible=meta.get("is_visible", True),
+            blueprint=blueprint,
+            manifest=meta,
+            mount=mount,
+        )
+
+    def resolve(self) -> Command:
+        """mount blueprint and get real command object
+
+        :raise CommandRuntimeError: blueprint import failed, mount is retried on next call
+        :raise CommandNotFoundError: stale manifest: blueprint has no command with this key
+        """
+        blueprint: LazyBlueprint = self.blueprint  # type: ignore[assignment]
+        try:
+            self.mount(blueprint)
+        except Exception as e:
+            raise CommandRuntimeError(f"{e!r} in `{blueprint.import_path}` blueprint mount") from e
+        if command := blueprint.app.command_manager.commands.get(self.key):  # type: ignore[union-attr]
+            return command
+        raise CommandNotFoundError(f"Command {self.key} not founded in `{blueprint.import_path}` blueprint")
+
+    def handle(self, command_text: str):
+        return self.resolve().handle(command_text)
+
+    @property
+    def arguments(self) -> List[str]:
+        return self.manifest.get("arguments", [])
+
+    @property
+    def docstring(self) -> str:
+        return self.manifest.get("docstring") or ""
+
+
+def _not_mounted(*_, **__):
+    raise RuntimeError("Lazy blueprint is not mounted")
@@ -0,0 +1,120 @@
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Memoization policy of pure command results
+
+    :param maxsize: max cached results
+    :param ttl: result time to live in seconds. None - no expiration
+    :param max_bytes: approximate memory limit of cached results. None - no limit
+    """
+
+    maxsize: int = 128
+    ttl: Optional[float] = None
+    max_bytes: Optional[int] = None
+
+    def __post_init__(self):
+        if self.maxsize < 1:
+            raise ValueError("maxsize should be positive")
+
+
+def _sizeof(value: Any) -> int:
+    """shallow size of value and its direct items"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        return size + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class CommandCache:
+    """LRU cache of command results keyed by normalized parsed arguments"""
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        # key: (expires at, size, result)
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._signature: Optional[inspect.Signature] = None
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _make_key(self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+        if self._signature is None:
+            self._signature = inspect.signature(fn)
+        # `f(1, b=2)` and `f(a=1, b=2)` are same call
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+        hash(key)
+        return key
+
+    def __call__(self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        try:
+            key = self._make_key(fn, args, kwargs)
+        except TypeError:
+            # unhashable or invalid arguments: call as is, errors are handled by command manager
+            return fn(*args, **kwargs)
+        with self._lock:
+            if entry := self._entries.get(key):
+                if entry[0] > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._pop(key)
+            self.misses += 1
+
+        result = fn(*args, **kwargs)
+        if inspect.isgenerator(result):
+            return result
+        self._store(key, result)
+        return result
+
+    def _store(self, key: Hashable, result: Any):
+        policy = self.policy
+        size = _sizeof(result) if policy.max_bytes is not None else 0
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            return
+        expires = monotonic() + policy.ttl if policy.ttl is not None else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (expires, size, result)
+            self.bytes += size
+            while len(self._entries) > policy.maxsize or (
+                policy.max_bytes is not None and self.bytes > policy.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key: Hashable):
+        self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
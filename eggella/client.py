@@ -0,0 +1,58 @@
+"""Thin client for `Eggella.serve_daemon`. Uses only standard library
+
+USAGE:
+    python -m eggella.client SOCKET_PATH COMMAND [ARGS ...]
+"""
+import shlex
+import socket
+import struct
+import sys
+from typing import List, Optional, TextIO
+
+# frame: kind (b"O" - stdout, b"E" - stderr, b"X" - exit code) + payload size (exit code for b"X")
+FRAME_HEADER = struct.Struct("!cI")
+
+
+def request(socket_path: str, line: str, stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None) -> int:
+    """send command line to daemon and stream output
+
+    :param socket_path: daemon unix socket path
+    :param line: command line
+    :param stdout: output stream. Default `sys.stdout`
+    :param stderr: errors output stream. Default `sys.stderr`
+    :return: command exit code
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(line.encode() + b"\n")
+        with sock.makefile("rb") as rfile:
+            while True:
+                header = rfile.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    print("Error! daemon closed connection", file=stderr)
+                    return 1
+                kind, size = FRAME_HEADER.unpack(header)
+                if kind == b"X":
+                    return size
+                stream = stdout if kind == b"O" else stderr
+                stream.write(rfile.read(size).decode())
+                stream.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    socket_path, *command = argv
+    try:
+        return request(socket_path, shlex.join(command))
+    except (ConnectionError, FileNotFoundError) as e:
+        print(f"Error! daemon is not available: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,46 @@
 import ast
 import inspect
 from contextlib import suppress
-from typing import Any, Callable, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from eggella.command.abc import ABCCommandArgumentsCaster
+from eggella.exceptions import CommandArgumentValueError, CommandTooManyArgumentsError
 from eggella.tools.type_caster import TypeCaster
 
 ARGS_AND_KWARGS = Tuple[Tuple[Any], Dict[str, Any]]
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _compile_signature(fn: Callable) -> Tuple[inspect.Signature, List[str], Optional[int]]:
+    """signature, parameters names and max positional arguments count (None if accept `*args`)"""
+    sig = inspect.signature(fn)
+    params = sig.parameters.values()
+    if any(p.kind is p.VAR_POSITIONAL for p in params):
+        max_positional = None
+    else:
+        max_positional = sum(1 for p in params if p.kind in _POSITIONAL)
+    return sig, list(sig.parameters.keys()), max_positional
+
+
+_compile_signature_cached = lru_cache(maxsize=1024)(_compile_signature)
+
+
+def _compiled_signature(fn: Callable) -> Tuple[inspect.Signature, List[str], Optional[int]]:
+    try:
+        return _compile_signature_cached(fn)
+    except TypeError:
+        # unhashable callable object
+        return _compile_signature(fn)
 
 
 class CommandArgumentsCaster(ABCCommandArgumentsCaster):
+    """Parse tokens to function arguments. Signature is validated before invocation:
+
+    :raise CommandTooManyArgumentsError: passed more positional arguments than function accept
+    :raise CommandArgumentValueError: arguments not bind to signature or not cast to annotations
+    """
+
     @staticmethod
     def _literal_eval(token: str) -> Any:
         # simple convert variables like list, dict, int, float
@@ -20,28 +51,30 @@ class CommandArgumentsCaster(ABCCommandArgumentsCaster):
 
     @staticmethod
     def _cast_arguments(fn: Callable, *args: Any, **kwargs: Any):
-        sig = inspect.signature(fn)
+        sig = _compiled_signature(fn)[0]
         params = sig.parameters
         tc = TypeCaster()
         bound = sig.bind(*args, **kwargs)
         # set defaults, if not set
         bound.apply_defaults()
-        for arg_name, values in bound.arguments.items():
-            if param := params.get(arg_name):
-                # *args
-                if isinstance(values, tuple) and param.kind is param.VAR_POSITIONAL:
-                    bound.arguments[arg_name] = tuple(tc.cast(param.annotation, v) for v in values)
-                # **kwargs
-                elif isinstance(values, dict) and param.kind is param.VAR_KEYWORD:
-                    bound.arguments[arg_name] = {k: tc.cast(param.annotation, v) for k, v in values.items()}
-                # positional
-                else:
-                    bound.arguments[arg_name] = tc.cast(param.annotation, values)
+        try:
+            for arg_name, values in bound.arguments.items():
+                if param := params.get(arg_name):
+                    # *args
+                    if isinstance(values, tuple) and param.kind is param.VAR_POSITIONAL:
+                        bound.arguments[arg_name] = tuple(tc.cast(param.annotation, v) for v in values)
+                    # **kwargs
+                    elif isinstance(values, dict) and param.kind is param.VAR_KEYWORD:
+                        bound.arguments[arg_name] = {k: tc.cast(param.annotation, v) for k, v in values.items()}
+                    # positional
+                    else:
+                        bound.arguments[arg_name] = tc.cast(param.annotation, values)
+        except ValueError as e:
+            raise CommandArgumentValueError(str(e)) from e
         return bound.args, bound.kwargs
 
     def __call__(self, fn: Callable, tokens: List[str]) -> ARGS_AND_KWARGS:
-        sig = inspect.signature(fn)
-        param_names = list(sig.parameters.keys())
+        sig, param_names, max_positional = _compiled_signature(fn)
         args: List[Any] = []
         kwargs = {}
 
@@ -53,8 +86,14 @@ class CommandArgumentsCaster(ABCCommandArgumentsCaster):
                 args.append(self._literal_eval(token))
             else:
                 args.append(self._literal_eval(token))
+        if max_positional is not None and len(args) > max_positional:
+            raise CommandTooManyArgumentsError("too many positional arguments")
         # bind parsed arguments, set defaults values
-        bound = sig.bind(*args, **kwargs)
+        try:
+            bound = sig.bind(*args, **kwargs)
+        except TypeError as e:
+            # missing required, unexpected keyword or multiple values of argument
+            raise CommandArgumentValueError(str(e)) from e
         # set defaults, if not set
         bound.apply_defaults()
         return self._cast_arguments(fn, *bound.args, **bound.kwargs)
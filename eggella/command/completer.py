@@ -1,38 +1,130 @@
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+import contextvars
+import queue
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from prompt_toolkit.completion import Completer, Completion, WordCompleter
 from prompt_toolkit.completion.base import CompleteEvent
 from prompt_toolkit.completion.nested import NestedDict
 from prompt_toolkit.document import Document
 
+from eggella.command.handler import CommandHandler
+from eggella.command.objects import EMPTY_META
+from eggella.command.providers import CompletionProvider
+from eggella.command.signature_completer import SignatureCompleter
 from eggella.exceptions import CommandNotFoundError
 
 if TYPE_CHECKING:
+    from eggella.command.objects import Command
     from eggella.manager import CommandManager
 
 
+_DONE = object()
+
+
+class BudgetCompleter(Completer):
+    """Run wrapped completer in worker thread and yield its completions progressively until time budget is over.
+
+    Unfinished request is cancelled on next request (user keeps typing) or when consumer stops iteration.
+    Only one worker per completer runs at once: while cancelled worker is blocked in wrapped completer
+    (slow source), next request waits for it up to time budget and yields nothing if it is still running.
+
+    :param completer: slow completer
+    :param budget: max seconds for wait completions
+    """
+
+    def __init__(self, completer: Completer, budget: float = 0.2):
+        self.completer = completer
+        self.budget = budget
+        self._lock = threading.Lock()
+        # in-flight worker: (cancelled, finished) events
+        self._worker: Optional[Tuple[threading.Event, threading.Event]] = None
+
+    def __repr__(self) -> str:
+        return f"BudgetCompleter({self.completer!r}, budget={self.budget!r})"
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
+        deadline = monotonic() + self.budget
+        with self._lock:
+            previous = self._worker
+        if previous is not None:
+            previous[0].set()
+            if not previous[1].wait(self.budget):
+                return
+        cancelled, finished = threading.Event(), threading.Event()
+        with self._lock:
+            if self._worker is not previous:
+                # concurrent request started own worker
+                return
+            self._worker = (cancelled, finished)
+        results: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+
+        def worker():
+            try:
+                for completion in self.completer.get_completions(document, complete_event):
+                    if cancelled.is_set():
+                        return
+                    results.put(completion)
+            except Exception:  # noqa
+                # completion errors should not break user input
+                pass
+            finally:
+                results.put(_DONE)
+                finished.set()
+
+        # context of caller: `get_app()` in wrapped completer returns running application
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(worker,), name="eggella-completer", daemon=True).start()
+        try:
+            while (timeout := deadline - monotonic()) > 0:
+                try:
+                    item = results.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    break
+                yield item  # type: ignore[misc]
+        finally:
+            cancelled.set()
+
+
 class NestedCommandCompleter(Completer):
     """Modification Nested completer with meta information"""
 
     def __init__(
-        self, options: Dict[str, Union[Completer, None]], ignore_case: bool = True, meta: Optional[Dict] = None
+        self, options: Dict[str, Union[Completer, None]], ignore_case: bool = True, meta: Optional[Mapping] = None
     ) -> None:
         self.options = options
         self.meta = meta or {}
         self.ignore_case = ignore_case
+        self._word_completer: Optional[WordCompleter] = None
 
     def __repr__(self) -> str:
         return f"NestedCommandCompleter({self.options!r}, {self.meta!r} ignore_case={self.ignore_case!r})"
 
     @classmethod
-    def from_nested_dict(cls, data: NestedDict, meta: Optional[Dict[str, str]] = None) -> "NestedCommandCompleter":
+    def from_nested_dict(
+        cls,
+        data: NestedDict,
+        meta: Optional[Mapping[str, str]] = None,
+        wrap: Optional[Callable[[Completer], Completer]] = None,
+    ) -> "NestedCommandCompleter":
+        """
+        :param data: nested completions
+        :param meta: completions meta
+        :param wrap: wrapper of user completers
+        """
         options: Dict[str, Union[Completer, None]] = {}
         meta = meta or {}
         for key, value in data.items():
             if isinstance(value, Completer):
-                options[key] = value
-            elif isinstance(value, dict):
-                options[key] = cls.from_nested_dict(value, meta)
+                options[key] = wrap(value) if wrap else value
+            elif isinstance(value, CompletionProvider):
+                # never blocks: serves cached values
+                options[key] = value  # type: ignore[assignment]
+            elif isinstance(value, Mapping):
+                options[key] = cls.from_nested_dict(value, meta, wrap)
             elif isinstance(value, set):
                 options[key] = cls.from_nested_dict({item: None for item in value}, meta)
             else:
@@ -65,14 +157,79 @@ class NestedCommandCompleter(Completer):
 
         # No space in the input: behave exactly like `WordCompleter`.
         else:
-            completer = WordCompleter(list(self.options.keys()), ignore_case=self.ignore_case, meta_dict=self.meta)
-            yield from completer.get_completions(document, complete_event)
+            if self._word_completer is None:
+                self._word_completer = WordCompleter(
+                    list(self.options.keys()), ignore_case=self.ignore_case, meta_dict=self.meta
+                )
+            yield from self._word_completer.get_completions(document, complete_event)
 
 
 class CommandCompleter(Completer):
-    def __init__(self, manager: "CommandManager", ignore_case: bool = True):
+    """
+    :param manager: command manager
+    :param ignore_case: ignore case
+    :param budget: time budget in seconds of each nested completer. None - run completers without budget
+    """
+
+    def __init__(self, manager: "CommandManager", ignore_case: bool = True, budget: Optional[float] = None):
         self.manager = manager
         self.ignore_case = ignore_case
+        self.budget = budget
+        # keep wrappers between keystrokes: new request cancels previous request of same completer
+        self._budgeted: Dict[int, BudgetCompleter] = {}
+        # command key: (nested dict, completer). Dropped on commands registry changes
+        self._nested: Dict[str, Tuple[NestedDict, NestedCommandCompleter]] = {}
+        # command key: (command, signature completer or None if arguments are not parsed)
+        self._signatures: Dict[str, Tuple["Command", Optional[SignatureCompleter]]] = {}
+        self._version = manager.completions_version
+        self._keys_version = manager.keys_version
+
+    def _wrap(self, completer: Completer) -> Completer:
+        if (wrapped := self._budgeted.get(id(completer))) is None or wrapped.completer is not completer:
+            wrapped = self._budgeted[id(completer)] = BudgetCompleter(completer, self.budget)  # type: ignore[arg-type]
+        return wrapped
+
+    def _check_version(self):
+        manager = self.manager
+        if self._version != manager.completions_version:
+            self._nested.clear()
+            self._signatures.clear()
+            self._budgeted.clear()
+            self._version = manager.completions_version
+        elif self._keys_version != manager.keys_version:
+            # only changed commands. Wrappers are not mapped to keys: cached nested completers keep own wrappers
+            for key, version in manager.changed_keys.items():
+                if version > self._keys_version:
+                    self._nested.pop(key, None)
+                    self._signatures.pop(key, None)
+            self._budgeted.clear()
+        self._keys_version = manager.keys_version
+
+    def _nested_completer(self, key: str, nested: NestedDict, meta: Mapping[str, str]) -> NestedCommandCompleter:
+        self._check_version()
+        if (cached := self._nested.get(key)) is None or cached[0] is not nested:
+            wrap = self._wrap if self.budget is not None else None
+            cached = self._nested[key] = (nested, NestedCommandCompleter.from_nested_dict(nested, meta, wrap))
+        return cached[1]
+
+    def _signature_completer(self, key: str) -> Optional[SignatureCompleter]:
+        """completer of command arguments from function signature, if nested completions not set"""
+        self._check_version()
+        try:
+            command = self.manager.get(key)
+        except CommandNotFoundError:
+            return None
+        if (cached := self._signatures.get(key)) is None or cached[0] is not command:
+            completer = None
+            handler = command.handler
+            parsed = isinstance(handler, CommandHandler) and handler.caster is not None
+            if parsed and not any((command.nested_completions or {}).values()):
+                try:
+                    completer = SignatureCompleter(command.fn)
+                except (TypeError, ValueError):  # no signature
+                    pass
+            cached = self._signatures[key] = (command, completer)
+        return cached[1]
 
     def get_completions(self, document: Document, complete_event: CompleteEvent):
         text_before_cursor = document.text_before_cursor
@@ -80,13 +237,15 @@ class CommandCompleter(Completer):
             text_before_cursor = text_before_cursor.lower()
         text_arr = text_before_cursor.split(" ")
         last_words = text_arr[-1]
+        if len(text_arr) > 1 and (signature := self._signature_completer(text_arr[0])):
+            arguments = document.text_before_cursor.split(" ", 1)[1]
+            yield from signature.get_completions(Document(arguments), complete_event)
+            return
         completions = self.__get_current_completions(text_arr[:-1])
-        if all(isinstance(d, dict) for d in completions):
+        if all(isinstance(d, Mapping) for d in completions):
             try:
                 nested, meta = completions
-                yield from NestedCommandCompleter.from_nested_dict(nested, meta).get_completions(
-                    document, complete_event
-                )
+                yield from self._nested_completer(text_arr[0], nested, meta).get_completions(document, complete_event)
             except (ValueError, TypeError):  # unpack err
                 yield
         else:
@@ -97,13 +256,13 @@ class CommandCompleter(Completer):
 
     def __get_current_completions(self, text_arr: List[str]):
         if not text_arr:
-            return self.manager.all_completions
+            return self.manager.completion_index
         command = text_arr[0]
         try:
             command_obj = self.manager.get(command)
         except CommandNotFoundError:
             return []
         if command_obj.nested_completions:
-            return command_obj.nested_completions, command_obj.nested_meta
+            return command_obj.nested_completions, command_obj.nested_meta or EMPTY_META
         elif command_obj:
             return [command_obj.completion]
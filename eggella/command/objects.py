@@ -1,36 +1,101 @@
 import inspect
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple
-
-from prompt_toolkit.completion.nested import NestedDict
+import sys
+from dataclasses import dataclass, fields, is_dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, List, Mapping, Optional, Tuple, Type, TypeVar, cast
 
 from eggella._types import ARGS_AND_KWARGS
 from eggella.command.handler import CommandHandler
 
+if TYPE_CHECKING:
+    from prompt_toolkit.completion.nested import NestedDict
+
+    from eggella.cache import CommandCache
+
+# shared by commands without own handler or meta: registry of thousands commands keeps one instance
+DEFAULT_HANDLER = CommandHandler()
+EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+_T = TypeVar("_T")
+
+
+def slotted(*extra: str) -> Callable[[Type[_T]], Type[_T]]:
+    """Add `__slots__` of fields to dataclass, like `dataclass(slots=True)` of python 3.10+
+
+    :param extra: not field attributes slots
+    """
+
+    def decorator(cls: Type[_T]) -> Type[_T]:
+        names = [f.name for f in fields(cls)]  # type: ignore[arg-type]
+        # fields of dataclass bases are already slotted
+        inherited = {f.name for base in cls.__bases__ if is_dataclass(base) for f in fields(base)}
+        namespace = {k: v for k, v in cls.__dict__.items() if k not in names and k not in ("__dict__", "__weakref__")}
+        namespace["__slots__"] = tuple(name for name in names if name not in inherited) + extra
+        return cast(Type[_T], type(cls.__name__, cls.__bases__, namespace))
+
+    return decorator
 
+
+@slotted("_arguments", "_docstring")
 @dataclass
 class Command:
+    """Registered command record
+
+    :param fn: command function
+    :param key: command key
+    :param handler: arguments parser
+    :param usage: usage example
+    :param short_description: description, default - first docstring line
+    :param nested_completions: `{key: nested completions}` or None
+    :param nested_meta: nested completions meta or None
+    :param is_visible: show in help and completions
+    :param cache: results memoization of pure command
+    """
+
     fn: Callable[..., Any]
     key: str
-    handler: Callable[[Callable[..., Any], str], ARGS_AND_KWARGS] = CommandHandler()
+    handler: Callable[[Callable[..., Any], str], ARGS_AND_KWARGS] = DEFAULT_HANDLER
     usage: Optional[str] = None
     short_description: Optional[str] = None
-    nested_completions: Optional[NestedDict] = None
-    nested_meta: Dict[str, Any] = field(default_factory=dict)
+    nested_completions: Optional["NestedDict"] = None
+    nested_meta: Optional[Mapping[str, Any]] = None
     is_visible: bool = True
+    cache: Optional["CommandCache"] = None
+
+    # placeholder of not imported blueprint command
+    is_lazy: ClassVar[bool] = False
+
+    def __post_init__(self) -> None:
+        # derived from signature and docstring on first access or loaded from registry snapshot
+        self._arguments: Optional[List[str]] = None
+        self._docstring: Optional[str] = None
+
+    def resolve(self) -> "Command":
+        """get real command object"""
+        return self
 
     def handle(self, command_text: str) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
         args, kwargs = self.handler(self.fn, command_text)
-        return self.fn(*args, **kwargs)
+        return self.invoke(args, kwargs)
+
+    def invoke(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """call function with parsed arguments"""
+        if self.cache is None:
+            return self.fn(*args, **kwargs)
+        return self.cache(self.fn, args, kwargs)
 
     @property
     def arguments(self) -> List[str]:
-        args = inspect.signature(self.fn).parameters.values()
-        return [str(arg) for arg in args]
+        if self._arguments is None:
+            # interned: generated commands share same parameters
+            self._arguments = [sys.intern(str(arg)) for arg in inspect.signature(self.fn).parameters.values()]
+        return self._arguments
 
     @property
     def docstring(self) -> str:
-        return inspect.getdoc(self.fn) or ""
+        if self._docstring is None:
+            self._docstring = inspect.getdoc(self.fn) or ""
+        return self._docstring
 
     def get_short_description(self):
         if self.short_description:
@@ -39,6 +104,10 @@ class Command:
             return self.docstring.split("\n")[0].strip()
         return ""
 
+    def get_command_description(self) -> str:
+        """lazy completion meta"""
+        return self.command_description
+
     @property
     def command_description(self):
         arg_list = ", ".join(f"{arg}" for arg in self.arguments)
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    from prompt_toolkit.completion import CompleteEvent, Completion
+    from prompt_toolkit.document import Document
+
+ProviderSource = Callable[[], Union[Iterable[str], Dict[str, str]]]
+
+
+class CompletionProvider:
+    """Dynamic completions values with TTL cache and stale-while-revalidate.
+
+    Completion never waits on source: stale or persisted values are served immediately
+    and refreshed in background thread. Before first refresh completes nothing is offered.
+
+    :param source: callable, returns values or `{value: meta}` dict
+    :param ttl: values time to live in seconds
+    :param persist_path: json file for keep values between sessions
+    :param ignore_case: case-insensitive prefix match
+    """
+
+    def __init__(
+        self,
+        source: ProviderSource,
+        ttl: float = 30.0,
+        persist_path: Optional[str] = None,
+        ignore_case: bool = True,
+    ):
+        self.source = source
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.ignore_case = ignore_case
+        self._items: Optional[Dict[str, str]] = None
+        # monotonic time of last success refresh
+        self._updated_at = float("-inf")
+        self._refreshing = threading.Lock()
+        self._loaded = False
+        self.last_error: Optional[BaseException] = None
+
+    def __repr__(self):
+        return f"CompletionProvider({self.source!r}, ttl={self.ttl!r})"
+
+    @property
+    def is_stale(self) -> bool:
+        return monotonic() - self._updated_at > self.ttl
+
+    def items(self) -> Dict[str, str]:
+        """cached values, starts background refresh if stale"""
+        if not self._loaded:
+            self._loaded = True
+            self._load()
+        if self.is_stale:
+            self.refresh(wait=False)
+        return self._items or {}
+
+    def refresh(self, wait: bool = True):
+        """update values from source
+
+        :param wait: False - run in background thread if refresh is not running yet
+        """
+        if not self._refreshing.acquire(blocking=wait):
+            return
+        if wait:
+            self._refresh()
+        else:
+            threading.Thread(target=self._refresh, name="eggella-completion-provider", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            values = self.source()
+            items = dict(values) if isinstance(values, dict) else dict.fromkeys(values, "")
+            self._items = {str(k): str(v or "") for k, v in items.items()}
+            self._updated_at = monotonic()
+            self.last_error = None
+            self._save()
+        except Exception as e:
+            # keep stale values, retry on next access after ttl
+            self.last_error = e
+            self._updated_at = monotonic()
+        finally:
+            self._refreshing.release()
+
+    def _load(self):
+        if not self.persist_path:
+            return
+        try:
+            with open(self.persist_path) as f:
+                data = json.load(f)
+            self._items = data["items"]
+            # wall clock age of persisted data to monotonic time
+            self._updated_at = monotonic() - max(0.0, time() - data["ts"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save(self):
+        if not self.persist_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+            tmp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"ts": time(), "items": self._items}, f)
+            os.replace(tmp_path, self.persist_path)
+        except OSError:
+            pass
+
+    def get_completions(self, document: "Document", complete_event: "CompleteEvent") -> Iterable["Completion"]:
+        from prompt_toolkit.completion import Completion
+
+        word = document.get_word_before_cursor(WORD=True)
+        prefix = word.lower() if self.ignore_case else word
+        for value, meta in self.items().items():
+            if (value.lower() if self.ignore_case else value).startswith(prefix):
+                yield Completion(value, -len(word), display_meta=meta)
+
+
+def wrap_providers(data: Any) -> Any:
+    """replace callables in nested completions dict by CompletionProvider"""
+    if isinstance(data, dict):
+        return {key: wrap_providers(value) for key, value in data.items()}
+    elif callable(data) and not hasattr(data, "get_completions"):
+        return CompletionProvider(data)
+    return data
@@ -0,0 +1,163 @@
+import inspect
+import os
+import shlex
+import threading
+from collections import OrderedDict
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple, Union, get_args, get_origin
+
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+NoneType = type(None)
+# parameter values: `{value: meta}`, PATH_VALUES or None if values can not be derived
+ParamValues = Union[Dict[str, str], object, None]
+PATH_VALUES = object()
+
+
+class DirectoryListingCache:
+    """LRU cache of `os.scandir` directories listings, invalidated by directory mtime
+
+    :param maxsize: max cached directories
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        # path: (mtime_ns, [(name, is_dir)])
+        self._listings: "OrderedDict[str, Tuple[int, List[Tuple[str, bool]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def listdir(self, path: str) -> List[Tuple[str, bool]]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        with self._lock:
+            if (cached := self._listings.get(path)) and cached[0] == mtime:
+                self._listings.move_to_end(path)
+                return cached[1]
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        entries.append((entry.name, entry.is_dir()))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        entries.sort()
+        with self._lock:
+            self._listings[path] = (mtime, entries)
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.maxsize:
+                self._listings.popitem(last=False)
+        return entries
+
+
+DIRECTORY_CACHE = DirectoryListingCache()
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def annotation_values(annotation: Any) -> ParamValues:
+    """completion values from annotation. None - values can not be derived"""
+    annotation = _unwrap_optional(annotation)
+    if get_origin(annotation) is Literal:
+        return {_quote(str(value)): "" for value in get_args(annotation)}
+    elif inspect.isclass(annotation):
+        if issubclass(annotation, Enum):
+            return {_quote(str(member.value)): name for name, member in annotation.__members__.items()}
+        elif annotation is bool:
+            return {"True": "", "False": ""}
+        elif issubclass(annotation, PurePath):
+            return PATH_VALUES
+    return None
+
+
+def _quote(value: str) -> str:
+    return shlex.quote(value) if value else "''"
+
+
+class _Param:
+    __slots__ = ("name", "kind", "values", "meta")
+
+    def __init__(self, param: inspect.Parameter):
+        self.name = param.name
+        self.kind = param.kind
+        self.values = annotation_values(param.annotation)
+        meta = []
+        if param.annotation is not param.empty:
+            meta.append(inspect.formatannotation(param.annotation))
+        if param.default is not param.empty:
+            meta.append(f"= {param.default!r}")
+        self.meta = " ".join(meta)
+
+
+class SignatureCompleter(Completer):
+    """Argument position aware completer derived from command function signature:
+    `key=` names and values of Literal, Enum, bool and Path annotated parameters
+
+    :param fn: command function
+    :param directory_cache: directories listings cache for Path parameters
+    """
+
+    def __init__(self, fn: Callable[..., Any], directory_cache: DirectoryListingCache = DIRECTORY_CACHE):
+        self.directory_cache = directory_cache
+        params = [_Param(p) for p in inspect.signature(fn).parameters.values()]
+        self.positional = [p for p in params if p.kind in (p.kind.POSITIONAL_ONLY, p.kind.POSITIONAL_OR_KEYWORD)]
+        self.var_positional = next((p for p in params if p.kind is p.kind.VAR_POSITIONAL), None)
+        self.keywords = {p.name: p for p in params if p.kind in (p.kind.POSITIONAL_OR_KEYWORD, p.kind.KEYWORD_ONLY)}
+
+    def __repr__(self) -> str:
+        return f"SignatureCompleter(positional={[p.name for p in self.positional]}, keywords={list(self.keywords)})"
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.keywords and (self.var_positional is None or self.var_positional.values is None)
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
+        *tokens, word = document.text_before_cursor.split(" ")
+        tokens = [t for t in tokens if t]
+        if "=" in word:
+            name, prefix = word.split("=", 1)
+            param: Optional[_Param] = self.keywords.get(name)
+            if param:
+                yield from self._values(param, prefix)
+            return
+
+        passed = {t.split("=", 1)[0] for t in tokens if "=" in t}
+        position = sum(1 for t in tokens if "=" not in t)
+        if position < len(self.positional):
+            param = self.positional[position]
+        else:
+            param = self.var_positional
+        if param is not None and param.name not in passed:
+            yield from self._values(param, word)
+
+        filled = passed.union(p.name for p in self.positional[:position])
+        for name, kw_param in self.keywords.items():
+            if name not in filled and name.startswith(word):
+                yield Completion(f"{name}=", -len(word), display_meta=kw_param.meta)
+
+    def _values(self, param: _Param, prefix: str) -> Iterable[Completion]:
+        if param.values is PATH_VALUES:
+            yield from self._paths(prefix)
+        elif isinstance(param.values, dict):
+            for value, meta in param.values.items():
+                if value.startswith(prefix):
+                    yield Completion(value, -len(prefix), display_meta=meta or param.name)
+
+    def _paths(self, prefix: str) -> Iterable[Completion]:
+        dirname, basename = os.path.split(prefix)
+        directory = os.path.expanduser(dirname) if dirname else "."
+        for name, is_dir in self.directory_cache.listdir(directory):
+            if name.startswith(basename) and (basename.startswith(".") or not name.startswith(".")):
+                yield Completion(f"{name}/" if is_dir else name, -len(basename), display_meta="dir" if is_dir else "")
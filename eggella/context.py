@@ -0,0 +1,217 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
+
+_Number = Union[int, float]
+_MISSING = object()
+
+
+class Accumulator:
+    """Lock-free sum of values. Every thread adds to own cell, readers sum all cells"""
+
+    __slots__ = ("_cells", "_local", "_lock")
+
+    def __init__(self):
+        self._cells: List[List[_Number]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _cell(self) -> List[_Number]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell: List[_Number] = [0]
+            # lock taken only once per thread
+            with self._lock:
+                self._cells = self._cells + [cell]
+            self._local.cell = cell
+            return cell
+
+    def add(self, value: _Number) -> None:
+        self._cell()[0] += value
+
+    @property
+    def value(self) -> _Number:
+        return sum(cell[0] for cell in self._cells)
+
+    def reset(self) -> None:
+        for cell in self._cells:
+            cell[0] = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.value!r})"
+
+
+class Counter(Accumulator):
+    """Lock-free counter"""
+
+    __slots__ = ()
+
+    def incr(self, n: int = 1) -> None:
+        self._cell()[0] += n
+
+
+class ContextStorage(MutableMapping):
+    """Application context storage.
+
+    Values are looked up in the active task scopes (innermost first), then session scope and fall back to the app scope.
+    Writes go to the innermost active layer. Scope layers are copy-on-write per context: child threads and asyncio
+    tasks inherit parent values, but their writes are not visible to parent.
+    App scope is copy-on-write: writers replace the whole dict under lock, readers never lock
+    and `snapshot()` returns read-only view without copying.
+    """
+
+    def __init__(self, data: Union[Mapping[Hashable, Any], None] = None):
+        self._data: Dict[Hashable, Any] = dict(data or {})
+        self._write_lock = threading.Lock()
+        self._session: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar(
+            f"eggella_ctx_session_{id(self)}", default=None
+        )
+        self._tasks: ContextVar[Tuple[Dict[Hashable, Any], ...]] = ContextVar(
+            f"eggella_ctx_tasks_{id(self)}", default=()
+        )
+
+    # scopes
+    @contextmanager
+    def session_scope(self, **initial: Any) -> Iterator["ContextStorage"]:
+        """scope for one user session (daemon connection, test client session).
+        Task scopes of outer session are not visible inside"""
+        layer: Dict[Hashable, Any] = {}
+        layer.update(initial)
+        session_token = self._session.set(layer)
+        tasks_token = self._tasks.set(())
+        try:
+            yield self
+        finally:
+            self._tasks.reset(tasks_token)
+            self._session.reset(session_token)
+
+    @contextmanager
+    def task_scope(self, **initial: Any) -> Iterator["ContextStorage"]:
+        """scope for one background job or async command, nested in current session and task scopes"""
+        layer: Dict[Hashable, Any] = {}
+        layer.update(initial)
+        token = self._tasks.set((layer,) + self._tasks.get())
+        try:
+            yield self
+        finally:
+            self._tasks.reset(token)
+
+    def scope(self, **initial: Any):
+        """push new task storage layer for current thread/asyncio task. Writes go to this layer"""
+        return self.task_scope(**initial)
+
+    @property
+    def in_scope(self) -> bool:
+        return bool(self._tasks.get()) or self._session.get() is not None
+
+    def _layers(self) -> Tuple[Dict[Hashable, Any], ...]:
+        """scope layers, innermost first"""
+        if (session := self._session.get()) is not None:
+            return self._tasks.get() + (session,)
+        return self._tasks.get()
+
+    def _replace_top(self, layer: Dict[Hashable, Any]) -> None:
+        # scope dicts are shared with copied contexts: replace layer in current context only
+        if tasks := self._tasks.get():
+            self._tasks.set((layer,) + tasks[1:])
+        else:
+            self._session.set(layer)
+
+    def _replace_layer(self, index: int, layer: Dict[Hashable, Any]) -> None:
+        tasks = self._tasks.get()
+        if index < len(tasks):
+            self._tasks.set(tasks[:index] + (layer,) + tasks[index + 1 :])
+        else:
+            self._session.set(layer)
+
+    # copy-on-write app scope
+    def set_app(self, key: Hashable, value: Any) -> None:
+        """set value in app scope, ignore active scopes"""
+        with self._write_lock:
+            data = self._data.copy()
+            data[key] = value
+            self._data = data
+
+    def snapshot(self) -> Mapping[Hashable, Any]:
+        """read-only consistent view of storage"""
+        if layers := self._layers():
+            merged = self._data.copy()
+            for layer in reversed(layers):
+                merged.update(layer)
+            return MappingProxyType(merged)
+        return MappingProxyType(self._data)
+
+    # hot keys
+    def counter(self, key: Hashable) -> Counter:
+        """get or create app scope lock-free counter"""
+        return self._setdefault_app(key, Counter)
+
+    def accumulator(self, key: Hashable) -> Accumulator:
+        """get or create app scope lock-free accumulator"""
+        return self._setdefault_app(key, Accumulator)
+
+    def _setdefault_app(self, key: Hashable, factory):
+        if (value := self._data.get(key, _MISSING)) is not _MISSING:
+            return value
+        with self._write_lock:
+            if (value := self._data.get(key, _MISSING)) is _MISSING:
+                value = factory()
+                data = self._data.copy()
+                data[key] = value
+                self._data = data
+        return value
+
+    # MutableMapping interface
+    def __getitem__(self, key: Hashable) -> Any:
+        for layer in self._layers():
+            if key in layer:
+                return layer[key]
+        return self._data[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if layers := self._layers():
+            layer = layers[0].copy()
+            layer[key] = value
+            self._replace_top(layer)
+        else:
+            self.set_app(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        """delete key from the innermost layer, which contains it"""
+        for index, layer in enumerate(self._layers()):
+            if key in layer:
+                layer = layer.copy()
+                del layer[key]
+                self._replace_layer(index, layer)
+                return
+        with self._write_lock:
+            data = self._data.copy()
+            del data[key]
+            self._data = data
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers()) or key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.snapshot())
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if self.in_scope:
+            return super().setdefault(key, default)
+        return self._setdefault_app(key, lambda: default)
+
+    def clear(self) -> None:
+        if self.in_scope:
+            self._replace_top({})
+            return
+        with self._write_lock:
+            self._data = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self.snapshot())!r})"
@@ -0,0 +1,100 @@
+import io
+import os
+import socketserver
+import stat
+from contextlib import redirect_stderr, redirect_stdout
+from typing import TYPE_CHECKING
+
+from eggella.client import FRAME_HEADER
+from eggella.runner import run_line
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+
+
+class _FrameWriter(io.TextIOBase):
+    """text stream, which sends every write to client as frame"""
+
+    def __init__(self, wfile, kind: bytes):
+        self._wfile = wfile
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            data = text.encode()
+            self._wfile.write(FRAME_HEADER.pack(self._kind, len(data)) + data)
+        return len(text)
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """handle one command line per connection"""
+
+    server: "DaemonServer"
+    # socket timeout seconds, applied in `setup()`: idle client does not block single-threaded server
+    timeout = 10.0
+
+    def handle(self):
+        from prompt_toolkit.application import create_app_session
+        from prompt_toolkit.input import DummyInput
+        from prompt_toolkit.output.plain_text import PlainTextOutput
+
+        try:
+            line = self.rfile.readline().decode().strip()
+        except OSError:
+            return
+        stdout, stderr = _FrameWriter(self.wfile, b"O"), _FrameWriter(self.wfile, b"E")
+        app = self.server.app
+        # every connection is own session: `app.CTX` writes are not leaked to next clients,
+        # prompt_toolkit output is bound to this connection, not cached for first one
+        with redirect_stdout(stdout), redirect_stderr(stderr), app.CTX.session_scope(), create_app_session(
+            input=DummyInput(), output=PlainTextOutput(stdout)
+        ):
+            code = run_line(app, line, stdout, stderr)
+        self.wfile.write(FRAME_HEADER.pack(b"X", code))
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    # requests are handled one by one: commands share app state and stdout redirect
+    def __init__(self, app: "Eggella", socket_path: str):
+        self.app = app
+        super().__init__(socket_path, DaemonRequestHandler)
+
+
+def _remove_stale_socket(socket_path: str):
+    try:
+        if stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+        else:
+            raise FileExistsError(f"`{socket_path}` exists and it is not a socket")
+    except FileNotFoundError:
+        pass
+
+
+def serve_daemon(app: "Eggella", socket_path: str):
+    """keep application warm and execute command lines from unix domain socket
+
+    :param app: Eggella application
+    :param socket_path: unix socket path
+    """
+    app._prepare()
+    _remove_stale_socket(socket_path)
+    old_umask = os.umask(0o177)
+    try:
+        server = DaemonServer(app, socket_path)
+    finally:
+        os.umask(old_umask)
+    app._handle_startup_events()
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _remove_stale_socket(socket_path)
+        app._handle_close_events()
@@ -1,13 +1,14 @@
-import traceback
-from difflib import SequenceMatcher
 from typing import Any, Iterable
 
 from prompt_toolkit import print_formatted_text as print_ft
+from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.formatted_text.html import HTML
 from prompt_toolkit.styles import Style
 
 from eggella.events.abc import ABCEvent
+from eggella.events.jsonl import suggest_command
 from eggella.shortcuts.cmd_shortcuts import yes_no_exit
+from eggella.tracebacks import TracebackRenderer
 
 
 class OnStartup(ABCEvent):
@@ -64,14 +65,7 @@ class OnSuggest(ABCEvent):
     _STYLE = Style.from_dict({"mean": "#ffff00 bold"})
 
     def __call__(self, command: str, possible_commands: Iterable[str]):
-        suggested_command = None
-        ratio = 0
-        for possible_command in possible_commands:
-            possible_ratio = SequenceMatcher(None, command, possible_command).ratio()
-            if possible_ratio > ratio:
-                ratio = possible_ratio  # type: ignore
-                suggested_command = possible_command
-        if suggested_command:
+        if suggested_command := suggest_command(command, possible_commands):
             print_ft(
                 HTML(f"Did your mean: <mean>{suggested_command}</mean> ?"),
                 style=self._STYLE,
@@ -109,32 +103,22 @@ class OnCommandRuntimeError(ABCEvent):
     _STYLE = Style.from_dict(
         {
             "cmd_key": "#7d7c80 italic",
-            'exc_stack': '#ffa200'
+            "exc_stack": "#ffa200",
+            "exc_similar": "#7d7c80 italic",
         }
     )
-
-
-    def _fmt_tb(self):
-        tb = traceback.format_exc()
-        # decrease stack trace for throw useful information
-        # (FSM call stack increase issue)
-        lines, seen = [], set()
-        for line in tb.split('\n'):
-            if line not in seen:
-                lines.append(line)
-                seen.add(line)
-        tb_lines = [
-            f'<exc_stack>{line}</exc_stack>' if line.startswith(' ')
-            else f'<ansired>{line}</ansired>' for line in lines]
-        print_ft(*[HTML(i) for i in tb_lines], sep='\n', style=self._STYLE)
+    # deep recursion and FSM states stacks are collapsed and capped
+    renderer = TracebackRenderer()
 
     def __call__(self, key: str, args: str, exc: Exception):
         print_ft(
-            HTML(f"<ansired>Error!</ansired> command `<cmd_key>{key}</cmd_key>` with args: {args}"),
+            FormattedText(
+                [("ansired", "Error!"), ("", " command `"), ("class:cmd_key", key), ("", f"` with args: {args}")]
+            ),
             style=self._STYLE,
         )
-        print_ft(HTML("Full traceback:"), style=self._STYLE)
-        self._fmt_tb()
+        print_ft("Traceback:")
+        print_ft(FormattedText(self.renderer.render(exc)), style=self._STYLE, end="")
 
 
 class OnCommandTooManyArgumentsError(ABCEvent):
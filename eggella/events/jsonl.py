@@ -0,0 +1,148 @@
+"""JSON-lines output events: one JSON object per line, without HTML and ANSI styling. For machine consumers.
+prompt_toolkit is not imported"""
+import json
+import sys
+from enum import Enum
+from types import GeneratorType
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from eggella.events.abc import ABCEvent
+from eggella.exceptions import CommandNotFoundError, CommandParseError, get_exit_code
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    elif isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+# reused compact encoder: one-shot `encode` runs C accelerated encoder (~3x faster than `iterencode` chunks)
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def write_record(record: Dict[str, Any], stream: Optional[TextIO] = None):
+    """write one JSON object line
+
+    :param stream: output stream. Default current `sys.stdout`
+    """
+    stream = stream or sys.stdout
+    stream.write(ENCODER.encode(record) + "\n")
+    stream.flush()
+
+
+def original_exception(exc: BaseException) -> BaseException:
+    """user exception, wrapped by eggella exception"""
+    return exc.__cause__ or exc.__context__ or exc
+
+
+# `ERROR_EVENTS` event name: error record event
+ERROR_RECORDS = {
+    "command_not_found_event": "not_found",
+    "command_error_event": "parse_error",
+    "command_runtime_err_event": "runtime_error",
+    "command_many_args_err_event": "too_many_arguments",
+    "command_argument_value_err_event": "argument_value_error",
+}
+
+
+def error_record(event_name: Optional[str], key: str, args: str, exc: BaseException) -> Dict[str, Any]:
+    """command error record, same in REPL and one-shot modes. Not routed exceptions are runtime errors
+
+    :param event_name: `ERROR_EVENTS` event name of exception
+    """
+    record: Dict[str, Any] = {
+        "event": ERROR_RECORDS.get(event_name or "", "runtime_error"),
+        "key": key,
+        "args": args,
+        "exit_code": get_exit_code(exc),
+    }
+    if event_name not in ("command_not_found_event", "command_error_event"):
+        cause = original_exception(exc)
+        record["exception"] = type(cause).__name__
+        record["message"] = str(cause)
+    return record
+
+
+def write_result(result: Any, stream: Optional[TextIO] = None) -> Optional[Exception]:
+    """write command result. Generator result is streamed item by item, without buffering whole result:
+    `{"event": "item", "value": ...}` lines and `{"event": "end", "items": count}`
+
+    :return: exception raised by generator
+    """
+    if not isinstance(result, GeneratorType):
+        write_record({"event": "result", "value": result}, stream)
+        return None
+    count = 0
+    try:
+        for item in result:
+            write_record({"event": "item", "value": item}, stream)
+            count += 1
+    except Exception as exc:
+        write_record(
+            {"event": "runtime_error", "exception": type(exc).__name__, "message": str(exc), "items": count}, stream
+        )
+        return exc
+    write_record({"event": "end", "items": count}, stream)
+    return None
+
+
+def suggest_command(command: str, possible_commands: Iterable[str]) -> Optional[str]:
+    """most similar command key"""
+    from difflib import SequenceMatcher
+
+    suggested_command = None
+    ratio = 0.0
+    for possible_command in possible_commands:
+        possible_ratio = SequenceMatcher(None, command, possible_command).ratio()
+        if possible_ratio > ratio:
+            ratio = possible_ratio
+            suggested_command = possible_command
+    return suggested_command
+
+
+class JsonKeyboardInterrupt(ABCEvent):
+    def __call__(self) -> bool:
+        return True
+
+
+class JsonEOFError(ABCEvent):
+    def __call__(self) -> bool:
+        return True
+
+
+class JsonCommandError(ABCEvent):
+    def __call__(self, key: str, inline_arguments: str):
+        write_record(error_record("command_error_event", key, inline_arguments, CommandParseError()))
+
+
+class JsonCommandNotFound(ABCEvent):
+    def __call__(self, key: str, inline_arguments: str):
+        write_record(error_record("command_not_found_event", key, inline_arguments, CommandNotFoundError()))
+
+
+class JsonSuggest(ABCEvent):
+    def __call__(self, command: str, possible_commands: Iterable[str]):
+        if suggested_command := suggest_command(command, possible_commands):
+            write_record({"event": "suggest", "key": command, "suggestion": suggested_command})
+
+
+class JsonCommandCompleteSuccess(ABCEvent):
+    def __call__(self, result: Any):
+        write_result(result)
+
+
+class JsonCommandArgumentValueError(ABCEvent):
+    def __call__(self, key: str, args: str, exc: Exception):
+        write_record(error_record("command_argument_value_err_event", key, args, exc))
+
+
+class JsonCommandRuntimeError(ABCEvent):
+    def __call__(self, key: str, args: str, exc: Exception):
+        write_record(error_record("command_runtime_err_event", key, args, exc))
+
+
+class JsonCommandTooManyArgumentsError(ABCEvent):
+    def __call__(self, key: str, args: str, exc: Exception):
+        write_record(error_record("command_many_args_err_event", key, args, exc))
@@ -1,22 +1,72 @@
+from typing import Dict, Generic, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
 class BaseEgellaException(Exception):
-    pass
+    exit_code: int = 1
 
 
 class CommandNotFoundError(BaseEgellaException):
-    pass
+    exit_code = 127
 
 
 class CommandParseError(BaseEgellaException):
-    pass
+    exit_code = 2
 
 
 class CommandTooManyArgumentsError(BaseEgellaException):
-    pass
+    exit_code = 2
 
 
 class CommandArgumentValueError(BaseEgellaException):
-    pass
+    exit_code = 2
 
 
 class CommandRuntimeError(BaseEgellaException):
-    pass
+    exit_code = 1
+
+
+def get_exit_code(exc: BaseException) -> int:
+    """map exception to shell exit code"""
+    if isinstance(exc, KeyboardInterrupt):
+        return 130
+    return getattr(exc, "exit_code", 1)
+
+
+class ExceptionRouter(Generic[T]):
+    """MRO-aware `exception type: value` table. Subclasses are routed to the nearest registered base class,
+    resolved routes are cached per exception class
+
+    :param routes: initial routes
+    """
+
+    def __init__(self, routes: Optional[Dict[Type[BaseException], T]] = None):
+        self.routes: Dict[Type[BaseException], T] = dict(routes or {})
+        self._resolved: Dict[Type[BaseException], Optional[T]] = {}
+
+    def __repr__(self):
+        return f"ExceptionRouter({self.routes!r})"
+
+    def __bool__(self) -> bool:
+        return bool(self.routes)
+
+    def add(self, exc_type: Type[BaseException], value: T, replace: bool = False):
+        """add route. Existing route is kept if not `replace`"""
+        if replace or exc_type not in self.routes:
+            self.routes[exc_type] = value
+            self._resolved.clear()
+
+    def update(self, other: "ExceptionRouter[T]"):
+        """add not registered routes of other router"""
+        for exc_type, value in other.routes.items():
+            self.add(exc_type, value)
+
+    def get(self, exc_type: Type[BaseException]) -> Optional[T]:
+        try:
+            return self._resolved[exc_type]
+        except KeyError:
+            pass
+        value = next((self.routes[cls] for cls in exc_type.__mro__ if cls in self.routes), None)
+        self._resolved[exc_type] = value
+        return value
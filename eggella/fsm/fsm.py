@@ -63,7 +63,7 @@ class Fsm:
         self._current_state = None
 
     def actual(self):
-        if self._current_state:
+        if self._current_state is not None:
             return self._exec_state(self._current_state)
 
     def next(self):
@@ -1,58 +1,106 @@
+import importlib
+import inspect
 import shlex
+import sys
+import threading
+from contextlib import suppress
 from functools import wraps
+from time import perf_counter_ns
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Literal,
+    Mapping,
     Optional,
     Set,
     Tuple,
     Type,
+    Union,
 )
 
-from prompt_toolkit.completion.nested import NestedDict
-
-from eggella._types import CALLABLE_ERR_HANDLER
-from eggella.command.completer import CommandCompleter
-from eggella.command.handler import CommandHandler
-from eggella.command.objects import Command
-from eggella.events.events import (
-    OnCommandArgumentValueError,
-    OnCommandCompleteSuccess,
-    OnCommandError,
-    OnCommandNotFound,
-    OnCommandRuntimeError,
-    OnCommandTooManyArgumentsError,
-    OnEOFError,
-    OnFSMEOFError,
-    OnFSMKeyboardInterrupt,
-    OnKeyboardInterrupt,
-    OnSuggest,
+from eggella._types import CALLABLE_ERR_HANDLER, CompletionMeta
+from eggella.blueprint import (
+    BlueprintIndex,
+    LazyBlueprint,
+    LazyCommand,
+    _default_index_path,
+    manifest_from_app,
 )
+from eggella.cache import CachePolicy, CommandCache
+from eggella.command.handler import CommandHandler, RawCommandHandler
+from eggella.command.objects import DEFAULT_HANDLER, Command
+from eggella.command.providers import wrap_providers
 from eggella.exceptions import (
+    BaseEgellaException,
     CommandArgumentValueError,
     CommandNotFoundError,
+    CommandParseError,
     CommandRuntimeError,
     CommandTooManyArgumentsError,
+    ExceptionRouter,
 )
-from eggella.shortcuts.help_pager import gen_help_commands, gen_man_pager
+from eggella.metrics import CommandMetrics
+from eggella.middleware import (
+    CallNext,
+    CommandCall,
+    Middleware,
+    MiddlewareLike,
+    as_middleware,
+    compile_chain,
+)
+from eggella.reloader import BlueprintReloader
+from eggella.shortcuts.help_pager import gen_help_commands
 
 if TYPE_CHECKING:
-    from eggella.app import Eggella
+    from prompt_toolkit.completion.nested import NestedDict
 
+    from eggella.snapshot import RegistrySnapshot
 
-_ErrorEventsMapping = Dict[str, Tuple[Type[BaseException], ...]]
+    from eggella.app import Eggella
+    from eggella.audit import AuditSink
+    from eggella.command.completer import CommandCompleter
+
+# eggella exception: error event name. Subclasses are routed to nearest base class event
+ERROR_EVENTS: ExceptionRouter[str] = ExceptionRouter(
+    {
+        CommandNotFoundError: "command_not_found_event",
+        CommandRuntimeError: "command_runtime_err_event",
+        CommandParseError: "command_error_event",
+        CommandTooManyArgumentsError: "command_many_args_err_event",
+        CommandArgumentValueError: "command_argument_value_err_event",
+    }
+)
 
 
 class CommandManager:
     def __init__(self, app: "Eggella"):
         self._app = app
         self.commands: Dict[str, Command] = {}
-        self.error_events: Dict[str, Callable[[str, BaseException, str, str], Any]] = {}
-        self.handled_exceptions: _ErrorEventsMapping = {}
+        # `on_error` handlers per command: unwrapped command function: exception type -> handler
+        self.error_handlers: Dict[Callable[..., Any], ExceptionRouter[CALLABLE_ERR_HANDLER]] = {}
+        # per-command calls, errors and latency. Disabled if None
+        self.metrics: Optional[CommandMetrics] = None
+        # commands audit records sink. Disabled if None
+        self.audit: Optional["AuditSink"] = None
+        self.middlewares: List[Middleware] = []
+        # compiled middlewares call chain. None if middlewares not used
+        self.chain: Optional[CallNext] = None
+        # increased on commands changes: completers drop cached derived data
+        self.completions_version = 0
+        # increased by `invalidate(*keys)`: completers drop cached data of keys changed after seen version
+        self.keys_version = 0
+        # command key: `keys_version` of last change
+        self.changed_keys: Dict[str, int] = {}
+        # ((completions_version, commands count), top level completions keys and meta)
+        self._completion_index: Optional[Tuple[Tuple[int, int], List[Tuple[str, CompletionMeta]]]] = None
+        # ((completions_version, commands count), visible commands keys)
+        self._suggestion_candidates: Optional[Tuple[Tuple[int, int], List[str]]] = None
+        # on-disk registry indexes, valid until commands registry changes
+        self.snapshot: Optional["RegistrySnapshot"] = None
 
     @staticmethod
     def _simple_parse_arguments(raw_command: str) -> Tuple[Tuple[str, ...], Dict[str, str]]:
@@ -68,56 +116,129 @@ class CommandManager:
         return tuple(args), kwargs
 
     def exec(self, key: str, args: str):
+        if self.metrics is not None or self.audit is not None:
+            return self.exec_timed(key, args, [0, 0, 0])
         command = self.get(key)
 
         if not command.is_visible:
             raise CommandNotFoundError
         try:
-            return command.handle(args)
-        except TypeError as e:
-            if 'too many positional arguments' in e.args[0]:
-                raise CommandTooManyArgumentsError(e.args[0]) from e
-            elif 'missing a required argument: ' in e.args[0]:
-                raise CommandArgumentValueError(e.args[0]) from e
+            fn_args, fn_kwargs = command.handler(command.fn, args)
+        except Exception as e:
+            return self._handle_parse_error(command, key, args, e)
+        try:
+            if self.chain is None:
+                return command.invoke(fn_args, fn_kwargs)
+            return self.chain(CommandCall(command, key, args, fn_args, fn_kwargs))
+        except Exception as e:
+            return self._handle_exec_error(command, key, args, e)
+
+    def use(self, *middlewares: MiddlewareLike):
+        """add middlewares. Chain compiled on application prepare, or immediately if app already running"""
+        self.middlewares.extend(as_middleware(mw) for mw in middlewares)
+        if self._app._is_prepared:
+            self.compile_middlewares()
+
+    def compile_middlewares(self):
+        self.chain = compile_chain(self.middlewares)
+
+    def exec_timed(self, key: str, args: str, timings: List[int]):
+        """execute command and write tokenize, cast, execute time in nanoseconds to timings list.
+        Record metrics and audit, if enabled"""
+        metrics, audit = self.metrics, self.audit
+        try:
+            command = self.get(key)
+            if not command.is_visible:
+                raise CommandNotFoundError
+            result = self._call_measured(command, key, args, timings)
+        except Exception as e:
+            if metrics is not None:
+                metrics.record(key, timings, e)
+            if audit is not None:
+                audit.record(key, args, sum(timings), ERROR_EVENTS.get(type(e)) or type(e).__name__)
+            raise
+        except KeyboardInterrupt:
+            # `exit` command and Ctrl+C in command stop application, it is not command error
+            self._record_complete(key, args, timings)
+            raise
+        self._record_complete(key, args, timings)
+        return result
+
+    def _record_complete(self, key: str, args: str, timings: List[int]):
+        if self.metrics is not None:
+            self.metrics.record(key, timings, None)
+        if self.audit is not None:
+            self.audit.record(key, args, sum(timings), "command_complete_event")
+
+    def _call_measured(self, command: Command, key: str, args: str, timings: List[int]):
+        handler = command.handler
+        start = perf_counter_ns()
+        tokenized = start
+        try:
+            if isinstance(handler, CommandHandler) and type(handler).handle is CommandHandler.handle:
+                tokens = handler.tokenizer(args)
+                tokenized = perf_counter_ns()
+                timings[0] = tokenized - start
+                fn_args, fn_kwargs = handler.caster(command.fn, tokens) if handler.caster else (tuple(tokens), {})
             else:
-                msg = f"{e!r} in `{command.fn.__name__}` callable"
-                raise CommandRuntimeError(msg) from e
-        except ValueError as e:
-            if e.args and 'invalid literal for' in e.args[0]:
-                raise CommandArgumentValueError(e.args[0]) from e
-            msg = f"{e!r} in `{command.fn.__name__}` callable"
-            raise CommandRuntimeError(msg) from e
+                # custom handler: tokenize and cast time can not be split
+                fn_args, fn_kwargs = handler(command.fn, args)
         except Exception as e:
-            if err_handler := self.error_events.get(command.fn.__name__):
-                handle_exceptions = self.handled_exceptions.get(command.fn.__name__, None)
-                if handle_exceptions and any(e.__class__ == exc for exc in handle_exceptions):
-                    _args, _kwargs = self._simple_parse_arguments(args)
-                    return err_handler(key, e, *_args, **_kwargs)
-                else:
-                    msg = f"{e!r} in `{command.fn.__name__}` callable"
-                    raise CommandRuntimeError(msg)
-            msg = f"{e!r} in `{command.fn.__name__}` callable"
-            raise CommandRuntimeError(msg)
-
-    def get_completer(self) -> CommandCompleter:
-        return CommandCompleter(self)  # type: ignore
+            timings[1] = perf_counter_ns() - tokenized
+            return self._handle_parse_error(command, key, args, e)
+        casted = perf_counter_ns()
+        timings[1] = casted - tokenized
+        try:
+            if self.chain is None:
+                return command.invoke(fn_args, fn_kwargs)
+            return self.chain(CommandCall(command, key, args, fn_args, fn_kwargs))
+        except Exception as e:
+            return self._handle_exec_error(command, key, args, e)
+        finally:
+            timings[2] = perf_counter_ns() - casted
+
+    def _handle_parse_error(self, command: Command, key: str, args: str, e: Exception):
+        """arguments parse phase error. Signature validation errors are raised by caster as eggella exceptions,
+        tokenizer and custom handlers `TypeError` and `ValueError` are arguments errors"""
+        if isinstance(e, BaseEgellaException):
+            raise e
+        elif isinstance(e, (TypeError, ValueError)):
+            raise CommandArgumentValueError(str(e)) from e
+        return self._handle_exec_error(command, key, args, e)
+
+    def error_handler(self, fn: Callable[..., Any], exc_type: Type[BaseException]) -> Optional[CALLABLE_ERR_HANDLER]:
+        """registered `on_error` handler of command function for exception type or its nearest base class"""
+        if router := self.error_handlers.get(inspect.unwrap(fn)):
+            return router.get(exc_type)
+        return None
+
+    def _handle_exec_error(self, command: Command, key: str, args: str, e: Exception):
+        """call registered error handler or wrap exception to CommandRuntimeError"""
+        if err_handler := self.error_handler(command.fn, type(e)):
+            _args, _kwargs = self._simple_parse_arguments(args)
+            return err_handler(key, e, *_args, **_kwargs)
+        raise CommandRuntimeError(f"{e!r} in `{getattr(command.fn, '__name__', command.key)}` callable") from e
+
+    def get_completer(self) -> "CommandCompleter":
+        from eggella.command.completer import CommandCompleter
+
+        return CommandCompleter(self, budget=self._app.completion_budget)  # type: ignore
 
     def on_error(self, *errors: Type[BaseException]):
         def decorator(handler: CALLABLE_ERR_HANDLER):
             @wraps(handler)
             def decorator_wrapper(func: Callable[..., Any]):
-                if not self.error_events.get(func.__name__):
-                    self.error_events[func.__name__] = handler
-                    self.handled_exceptions[func.__name__] = errors
+                # keyed by command function, not by name: stacked `on_command` wrappers are unwrapped
+                router = self.error_handlers.setdefault(inspect.unwrap(func), ExceptionRouter())
+                for exc in errors:
+                    router.add(exc, handler)
 
                 @wraps(func)
                 def wrapper(*args, **kwargs):
                     try:
                         return func(*args, **kwargs)
-                    except BaseException as e:
-                        if any(e.__class__ == exc for exc in errors):
-                            return handler("", e, *args, **kwargs)
-                        raise e
+                    except errors as e:
+                        return handler("", e, *args, **kwargs)
 
                 return wrapper
 
@@ -125,13 +246,55 @@ class CommandManager:
 
         return decorator
 
+    @property
+    def registry_version(self) -> Tuple[int, int]:
+        """changed on commands registration and removal"""
+        return self.completions_version, len(self.commands)
+
+    def _valid_snapshot(self) -> Optional["RegistrySnapshot"]:
+        if self.snapshot is not None and self.snapshot.is_valid(self):
+            return self.snapshot
+        return None
+
+    @property
+    def completion_index(self) -> List[Tuple[str, CompletionMeta]]:
+        """visible commands keys and completion meta. Cached until commands registry changes.
+        Meta is description or its getter: signature is inspected only for rendered completions"""
+        version = self.registry_version
+        if self._completion_index is None or self._completion_index[0] != version:
+            rows: List[Tuple[str, CompletionMeta]]
+            if snapshot := self._valid_snapshot():
+                rows = snapshot.completions  # type: ignore[assignment]
+            else:
+                rows = [(com.key, com.get_command_description) for com in self.commands.values() if com.is_visible]
+            self._completion_index = (version, rows)
+        return self._completion_index[1]
+
     @property
     def all_completions(self) -> List[Tuple[str, str]]:
-        return [com.completion for com in self.commands.values() if com.is_visible]
+        """visible commands keys and descriptions"""
+        return [(key, meta if isinstance(meta, str) else meta()) for key, meta in self.completion_index]
+
+    @property
+    def suggestion_candidates(self) -> List[str]:
+        """visible commands keys for `command not found` suggestions. Cached until commands registry changes"""
+        version = self.registry_version
+        if self._suggestion_candidates is None or self._suggestion_candidates[0] != version:
+            if snapshot := self._valid_snapshot():
+                keys = snapshot.suggestions
+            else:
+                keys = [com.key for com in self.commands.values() if com.is_visible]
+            self._suggestion_candidates = (version, keys)
+        return self._suggestion_candidates[1]
+
+    def load_snapshot_metadata(self):
+        """apply commands arguments and docstrings from registry snapshot"""
+        if snapshot := self._valid_snapshot():
+            snapshot.load_metadata()
 
     def get(self, key: str) -> Command:
         if command := self.commands.get(key, None):
-            return command
+            return command.resolve() if command.is_lazy else command
         raise CommandNotFoundError(f"Command {key} not founded")
 
     def command(
@@ -141,9 +304,10 @@ class CommandManager:
         short_description: Optional[str] = None,
         usage: Optional[str] = None,
         cmd_handler: Optional[Callable[[Callable[..., Any], str], Tuple[Tuple[Any, ...], Dict[str, Any]]]] = None,
-        nested_completions: Optional[NestedDict] = None,
+        nested_completions: Optional["NestedDict"] = None,
         nested_meta: Optional[Dict[str, Any]] = None,
         is_visible: bool = True,
+        cache: Optional[CachePolicy] = None,
     ):
         def decorator(func: Callable):
             self.register_command(
@@ -155,6 +319,7 @@ class CommandManager:
                 nested_completions=nested_completions,
                 nested_meta=nested_meta,
                 is_visible=is_visible,
+                cache=cache,
             )
 
             @wraps(func)
@@ -173,40 +338,33 @@ class CommandManager:
         short_description: Optional[str] = None,
         usage: Optional[str] = None,
         cmd_handler: Optional[Callable[[Callable[..., Any], str], Tuple[Tuple[Any, ...], Dict[str, Any]]]] = None,
-        nested_completions: Optional[NestedDict] = None,
+        nested_completions: Optional["NestedDict"] = None,
         nested_meta: Optional[Dict[str, Any]] = None,
         is_visible: bool = True,
+        cache: Optional[CachePolicy] = None,
     ):
         if not key:
             key = func.__name__
         if self.commands.get(key):
             raise TypeError(f"Command '{key}' already register")
 
-        if not cmd_handler:
-            self.commands[key] = Command(
-                fn=func,
-                key=key,
-                handler=CommandHandler(),
-                short_description=short_description,
-                usage=usage,
-                nested_completions={key: nested_completions},
-                nested_meta=nested_meta or {},
-                is_visible=is_visible,
-            )
-        else:
-            self.commands[key] = Command(
-                fn=func,
-                key=key,
-                handler=cmd_handler,
-                short_description=short_description,
-                usage=usage,
-                nested_completions={key: nested_completions},
-                nested_meta=nested_meta or {},
-                is_visible=is_visible,
-            )
+        key = sys.intern(key)
+        self.commands[key] = Command(
+            fn=func,
+            key=key,
+            handler=cmd_handler or DEFAULT_HANDLER,
+            short_description=short_description,
+            usage=usage,
+            nested_completions={key: wrap_providers(nested_completions)} if nested_completions else None,
+            nested_meta=nested_meta or None,
+            is_visible=is_visible,
+            cache=CommandCache(cache) if cache else None,
+        )
+        self.completions_version += 1
 
     def _help_command(self, key: Optional[str] = None):
         """show help or print all available commands if not argument passed"""
+        self.load_snapshot_metadata()
         if not key:
             return gen_help_commands(self._app)
         elif comma := self.commands.get(key):
@@ -216,8 +374,109 @@ class CommandManager:
 
     def _man_page(self):
         """generate man page view with all commands"""
+        from eggella.shortcuts.help_pager import gen_man_pager
+
+        self.load_snapshot_metadata()
         gen_man_pager(self._app)
 
+    def _reload_command(self, mode: str = ""):
+        """reload changed blueprints modules. `.reload all` - reload all blueprints"""
+        if report := self._app.blueprint_manager.reload(force=mode == "all"):
+            return "\n".join(report)
+        return "nothing changed"
+
+    def _stats_command(self, action: str = "", path: str = "", fmt: str = "json"):
+        """show commands metrics. `.stats reset` - clear, `.stats export PATH [json|prometheus]` - write to file"""
+        if self.metrics is None:
+            return "metrics disabled"
+        if action == "reset":
+            self.metrics.reset()
+            return None
+        elif action == "export":
+            self.metrics.export(path, fmt)
+            return f"metrics saved to {path}"
+        return self.metrics.report()
+
+    def _cache_command(self, action: str = "stats", key: str = ""):
+        """show cached commands stats. `.cache clear [KEY]` - drop cached results of all or one command"""
+        caches = {k: c.cache for k, c in self.commands.items() if not c.is_lazy and c.cache is not None}
+        if action == "clear":
+            if key and key not in caches:
+                return f"command `{key}` is not cached"
+            for cache in [caches[key]] if key else caches.values():
+                cache.clear()
+            return None
+        lines = []
+        for cmd_key, cache in caches.items():
+            stats = " ".join(f"{name}={value}" for name, value in cache.stats().items())
+            lines.append(f"{cmd_key}: {stats}")
+        return "\n".join(lines)
+
+    def _run_line(self, line: str) -> Callable[[], Any]:
+        key, args = self._app._split_line(line.strip())
+        return lambda: self.exec(key, args)
+
+    def _print_report(self, result: Any, report: str):
+        if isinstance(result, Exception):
+            report = f"{report}\ncommand failed: {type(result).__name__}: {result}"
+        elif result:
+            self._app.event_manager.command_complete_event(result)
+        # plain text: profiler reports contain `<...>` names, complete event renders result as HTML
+        self._app.cmd.print_ft(report)
+
+    def _profile_command(self, line: str):
+        """run command under cProfile and show top cumulative entries. `.profile sample N` - profile every Nth call"""
+        from eggella.profiling import parse_options, profile_call, sample_command
+
+        try:
+            if line == "sample" or line.startswith("sample "):
+                self._app.cmd.print_ft(sample_command(self, line.split()[1:]))
+                return None
+            options, line = parse_options(line, ("-n", "-o"))
+        except ValueError as e:
+            return f"{e}. usage: {self.commands['.profile'].usage}"
+        result, report = profile_call(self._run_line(line), options.get("-n", 20), options.get("-o"))
+        self._print_report(result, report)
+        return None
+
+    def _mem_command(self, line: str):
+        """run command under tracemalloc and show top allocation sites and net memory growth"""
+        from eggella.profiling import parse_options, trace_memory
+
+        try:
+            options, line = parse_options(line, ("-n",))
+        except ValueError as e:
+            return f"{e}. usage: {self.commands['.mem'].usage}"
+        result, report = trace_memory(self._run_line(line), options.get("-n", 10))
+        self._print_report(result, report)
+        return None
+
+    def invalidate(self, *keys: str):
+        """drop derived data of changed (added, replaced or removed) commands: completions and descriptions.
+        Derived data of other commands is kept. `help` completions are views of registry and always actual
+
+        :param keys: changed commands keys. Without keys - drop all derived data
+        """
+        if not keys:
+            self.completions_version += 1
+            return
+        self.keys_version += 1
+        for key in keys:
+            self.changed_keys[key] = self.keys_version
+        changed = set(keys)
+        if self._completion_index is not None:
+            rows = {row[0]: row for row in self._completion_index[1]}
+            self._completion_index = (
+                self.registry_version,
+                [
+                    (com.key, com.get_command_description) if key in changed or key not in rows else rows[key]
+                    for key, com in self.commands.items()
+                    if com.is_visible
+                ],
+            )
+        # visible keys: cheap to rebuild on next usage
+        self._suggestion_candidates = None
+
     @staticmethod
     def _exit_command():
         """exit from this application"""
@@ -226,41 +485,141 @@ class CommandManager:
     def register_buildin_commands(self):
         self.register_command(self._exit_command, "exit")
         self.register_command(self._man_page, ".man")
+        self.register_command(
+            self._profile_command,
+            ".profile",
+            usage=".profile add 1 2; .profile -n 40 -o add.pstats add 1 2; .profile sample 100; .profile sample; "
+            ".profile sample save sample.pstats; .profile sample off",
+            cmd_handler=RawCommandHandler(),
+        )
+        self.register_command(
+            self._mem_command, ".mem", usage=".mem add 1 2; .mem -n 20 add 1 2", cmd_handler=RawCommandHandler()
+        )
+        if self.metrics is not None:
+            self.register_command(
+                self._stats_command, ".stats", usage=".stats; .stats reset; .stats export metrics.prom prometheus"
+            )
+        if any(c.cache is not None for c in self.commands.values()):
+            self.register_command(self._cache_command, ".cache", usage=".cache; .cache clear; .cache clear KEY")
+        if self._app.blueprint_manager.blueprints:
+            self.register_command(self._reload_command, ".reload", usage=".reload; .reload all")
 
-        # generate nested for help command
-        _nested_commands = {k: None for k in self.commands.keys()}
-        _nested_meta = {}
-        _nested_meta.update({k: v.command_description for k, v in self.commands.items()})
+        # help completions: views of registry instead of copies
         self.register_command(
             self._help_command,
             "help",
             usage="help; help exit",
-            nested_completions=_nested_commands,
-            nested_meta=_nested_meta,
+            nested_completions=CommandsKeysView(self.commands),
+            nested_meta=CommandsDescriptionsView(self.commands),
         )
 
 
+class CommandsKeysView(Mapping[str, None]):
+    """Read-only `{key: None}` view of commands registry for nested completions"""
+
+    __slots__ = ("_commands",)
+
+    def __init__(self, commands: Dict[str, Command]):
+        self._commands = commands
+
+    def __getitem__(self, key: str) -> None:
+        if key not in self._commands:
+            raise KeyError(key)
+        return None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._commands)
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} commands)"
+
+
+class CommandsDescriptionsView(CommandsKeysView, Mapping[str, str]):  # type: ignore[misc]
+    """Read-only `{key: description}` view of commands registry. Descriptions are computed on access"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> str:  # type: ignore[override]
+        return self._commands[key].command_description
+
+
+class _DefaultEvent:
+    """Create default event from `eggella.events.events` on first access.
+    Avoid prompt_toolkit import, if application runs without REPL.
+    In `jsonl` output format event is taken from `eggella.events.jsonl`"""
+
+    def __init__(self, event_name: str, jsonl_event_name: Optional[str] = None):
+        self.event_name = event_name
+        self.jsonl_event_name = jsonl_event_name
+        self.attr_name = ""
+
+    def __set_name__(self, owner, name: str):
+        self.attr_name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.jsonl_event_name and instance.app.output_format == "jsonl":
+            from eggella.events import jsonl
+
+            event = getattr(jsonl, self.jsonl_event_name)()
+        else:
+            from eggella.events import events
+
+            event = getattr(events, self.event_name)()
+        instance.__dict__[self.attr_name] = event
+        return event
+
+
 class EventManager:
+    # TODO typing more accurately
+    # loop events
+    kb_interrupt_event: Callable[..., bool] = _DefaultEvent(  # type: ignore[assignment]
+        "OnKeyboardInterrupt", "JsonKeyboardInterrupt"
+    )
+    eof_event: Callable[..., bool] = _DefaultEvent("OnEOFError", "JsonEOFError")  # type: ignore[assignment]
+    # commands events
+    command_error_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandError", "JsonCommandError"
+    )
+    command_not_found_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandNotFound", "JsonCommandNotFound"
+    )
+    command_complete_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandCompleteSuccess", "JsonCommandCompleteSuccess"
+    )
+    command_suggest_event: Optional[Callable[..., None]] = _DefaultEvent(  # type: ignore[assignment]
+        "OnSuggest", "JsonSuggest"
+    )
+    command_many_args_err_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandTooManyArgumentsError", "JsonCommandTooManyArgumentsError"
+    )
+    command_argument_value_err_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandArgumentValueError", "JsonCommandArgumentValueError"
+    )
+    command_runtime_err_event: Callable[..., None] = _DefaultEvent(  # type: ignore[assignment]
+        "OnCommandRuntimeError", "JsonCommandRuntimeError"
+    )
+    # FSM events
+    fsm_kb_interrupt_event: Callable[..., bool] = _DefaultEvent("OnFSMKeyboardInterrupt")  # type: ignore[assignment]
+    fsm_eof_error_event: Callable[..., bool] = _DefaultEvent("OnFSMEOFError")  # type: ignore[assignment]
+
+    def reset_default_events(self):
+        """drop created default events: recreated for current output format on next access"""
+        for name, value in list(self.__dict__.items()):
+            if isinstance(getattr(type(self), name, None), _DefaultEvent) and type(value).__module__.startswith(
+                "eggella.events."
+            ):
+                del self.__dict__[name]
+
     def __init__(self, app: "Eggella"):
         self.app = app
         self.startup_events: List[Callable] = []
         self.close_events: List[Callable] = []
         self.errors_events: Dict[str, Callable] = {}
-        # TODO typing more accurately
-        # loop events
-        self.kb_interrupt_event: Callable[..., bool] = OnKeyboardInterrupt()
-        self.eof_event: Callable[..., bool] = OnEOFError()
-        # commands events
-        self.command_error_event: Callable[..., None] = OnCommandError()
-        self.command_not_found_event: Callable[..., None] = OnCommandNotFound()
-        self.command_complete_event: Callable[..., None] = OnCommandCompleteSuccess()
-        self.command_suggest_event: Optional[Callable[..., None]] = OnSuggest()
-        self.command_many_args_err_event: Callable[..., None] = OnCommandTooManyArgumentsError()
-        self.command_argument_value_err_event: Callable[..., None] = OnCommandArgumentValueError()
-        self.command_runtime_err_event: Callable[..., None] = OnCommandRuntimeError()
-        # FSM events
-        self.fsm_kb_interrupt_event: Callable[..., bool] = OnFSMKeyboardInterrupt()
-        self.fsm_eof_error_event: Callable[..., bool] = OnFSMEOFError()
 
     def register_event(
         self,
@@ -321,34 +680,117 @@ class BlueprintManager:
     def __init__(self, main_app: "Eggella"):
         self.app = main_app
 
-        self.blueprints: List["Eggella"] = []
+        self.blueprints: List[Union["Eggella", LazyBlueprint]] = []
         self._loaded_blueprints: Set[str] = set()
+        self.reloader = BlueprintReloader(self)
+        # lazy blueprints manifests cache. Default `$XDG_CACHE_HOME/eggella/blueprints-{app_name}.json`
+        self.index_path: Optional[str] = None
+        self._index: Optional[BlueprintIndex] = None
 
-    def register_blueprints(self, *bp_apps: "Eggella"):
+    @property
+    def index(self) -> BlueprintIndex:
+        if self._index is None:
+            self._index = BlueprintIndex(self.index_path or _default_index_path(self.app.app_name))
+        return self._index
+
+    def register_blueprints(self, *bp_apps: Union["Eggella", LazyBlueprint, str]):
         for bp_app in bp_apps:
+            if isinstance(bp_app, str):
+                bp_app = LazyBlueprint(bp_app)
             self.blueprints.append(bp_app)
 
     def load_blueprints(self):
         for blueprint in self.blueprints:
             if blueprint.app_name in self._loaded_blueprints:
                 continue
-            # register commands to main app
-            for key, command in blueprint.command_manager.commands.items():
-                if self.app.command_manager.commands.get(key) and not self.app.overwrite_commands_from_blueprints:
-                    raise TypeError(
-                        f"Command '{key}' from blueprint `{blueprint.app_name}` already registered. "
-                        f"For overwrite commands set `overwrite_commands_from_blueprints=True`"
-                    )
-                self.app.command_manager.commands[key] = command
-            # register FSM groups to main app
-            for key, fsm_state in blueprint.fsm.fsm_storage.items():
-                self.app.fsm.fsm_storage[key] = fsm_state
-
-            # register events
-            for start_ev in blueprint.event_manager.startup_events:
-                self.app.event_manager.startup_events.append(start_ev)
-
-            for close_ev in blueprint.event_manager.close_events:
-                self.app.event_manager.close_events.append(close_ev)
-
+            if isinstance(blueprint, LazyBlueprint):
+                self._load_lazy_blueprint(blueprint)
+            else:
+                self._merge_blueprint(blueprint)
+                self.reloader.track(blueprint)
             self._loaded_blueprints.add(blueprint.app_name)
+
+    def _check_command_key(self, key: str, blueprint_name: str):
+        if self.app.command_manager.commands.get(key) and not self.app.overwrite_commands_from_blueprints:
+            raise TypeError(
+                f"Command '{key}' from blueprint `{blueprint_name}` already registered. "
+                f"For overwrite commands set `overwrite_commands_from_blueprints=True`"
+            )
+
+    def _merge_blueprint(self, blueprint: "Eggella"):
+        # register commands to main app
+        for key, command in blueprint.command_manager.commands.items():
+            self._check_command_key(key, blueprint.app_name)
+            self.app.command_manager.commands[key] = command
+        self.app.command_manager.error_handlers.update(blueprint.command_manager.error_handlers)
+        # register FSM groups to main app
+        for key, fsm_state in blueprint.fsm.fsm_storage.items():
+            self.app.fsm.fsm_storage[key] = fsm_state
+
+        # register events
+        for start_ev in blueprint.event_manager.startup_events:
+            self.app.event_manager.startup_events.append(start_ev)
+
+        for close_ev in blueprint.event_manager.close_events:
+            self.app.event_manager.close_events.append(close_ev)
+
+    def _load_lazy_blueprint(self, blueprint: LazyBlueprint):
+        manifest = blueprint.manifest or self.index.get(blueprint.import_path, blueprint.module_name)
+        if manifest is None:
+            # index is not cached yet: import now, next startup will be lazy
+            self.mount(blueprint, run_startup_events=False)
+            return
+        for key, meta in manifest.items():
+            self._check_command_key(key, blueprint.import_path)
+            self.app.command_manager.commands[key] = LazyCommand.from_manifest(key, meta, blueprint, self.mount)
+
+    def mount(self, blueprint: LazyBlueprint, run_startup_events: bool = True):
+        """import lazy blueprint and replace commands placeholders
+
+        :param blueprint: lazy blueprint
+        :param run_startup_events: run blueprint startup events (main app already started)
+        """
+        if blueprint.is_mounted:
+            return
+        with blueprint._lock:
+            if blueprint.is_mounted:
+                return
+            bp_app = blueprint.import_app()
+            commands = self.app.command_manager.commands
+            placeholders = [k for k, c in commands.items() if c.is_lazy and c.blueprint is blueprint]  # type: ignore
+            for key in placeholders:
+                del commands[key]
+            self._merge_blueprint(bp_app)
+            if not blueprint.manifest:
+                self.index.set(blueprint.import_path, blueprint.module_name, manifest_from_app(bp_app))
+            blueprint.app = bp_app
+            self.reloader.track(bp_app)
+            self.app.command_manager.invalidate(*placeholders, *bp_app.command_manager.commands)
+        if run_startup_events:
+            for event in bp_app.event_manager.startup_events:
+                event()
+
+    def reload(self, force: bool = False) -> List[str]:
+        """re-import changed blueprints modules and swap changed commands, FSM groups and events
+
+        :param force: reload all blueprints
+        :return: report lines
+        """
+        return self.reloader.reload(force)
+
+    def warm_up(self) -> Optional[threading.Thread]:
+        """import not mounted lazy blueprints modules in background thread.
+        Blueprints are still mounted on first usage, but without import delay"""
+        modules = [bp.module_name for bp in self.blueprints if isinstance(bp, LazyBlueprint) and not bp.is_mounted]
+        if not modules:
+            return None
+
+        def import_modules():
+            for module in modules:
+                # errors will be raised on mount
+                with suppress(Exception):
+                    importlib.import_module(module)
+
+        thread = threading.Thread(target=import_modules, name="eggella-blueprints-warm-up", daemon=True)
+        thread.start()
+        return thread
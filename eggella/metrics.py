@@ -0,0 +1,186 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from eggella.exceptions import CommandNotFoundError
+
+PHASES = ("tokenize", "cast", "execute")
+# log2 buckets of nanoseconds: 1ns .. ~9.2e18ns
+_BUCKETS = 64
+
+
+def _label(value: str) -> str:
+    """escape prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LatencyHistogram:
+    """Streaming latency histogram with power of two nanoseconds buckets"""
+
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns: int):
+        self.buckets[min(ns.bit_length(), _BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> int:
+        """approximate percentile: upper bound of bucket in nanoseconds"""
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            "buckets": {1 << i: c for i, c in enumerate(self.buckets) if c},
+        }
+
+
+class CommandStats:
+    __slots__ = ("calls", "errors", "phases")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.phases: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "phases": {phase: hist.to_dict() for phase, hist in self.phases.items()},
+        }
+
+
+def _fmt_ns(ns: int) -> str:
+    if ns < 1_000:
+        return f"{ns}ns"
+    elif ns < 1_000_000:
+        return f"{ns / 1_000:.1f}us"
+    elif ns < 1_000_000_000:
+        return f"{ns / 1_000_000:.1f}ms"
+    return f"{ns / 1_000_000_000:.2f}s"
+
+
+class CommandMetrics:
+    """Per-command calls and errors counters, tokenize/cast/execute latency histograms"""
+
+    def __init__(self):
+        self.commands: Dict[str, CommandStats] = {}
+        # not founded keys are not stored: avoid unbounded grow from typos
+        self.not_found = 0
+
+    def record(self, key: str, timings: List[int], error: Optional[BaseException]):
+        if isinstance(error, CommandNotFoundError):
+            self.not_found += 1
+            return
+        if not (stats := self.commands.get(key)):
+            stats = self.commands[key] = CommandStats()
+        stats.calls += 1
+        if error is not None:
+            name = error.__class__.__name__
+            stats.errors[name] = stats.errors.get(name, 0) + 1
+        tokenize, cast, execute = timings
+        phases = stats.phases
+        # zero - phase is not reached or not measurable (custom command handler)
+        if tokenize:
+            phases["tokenize"].add(tokenize)
+        if cast:
+            phases["cast"].add(cast)
+        if execute:
+            phases["execute"].add(execute)
+
+    def reset(self):
+        self.commands.clear()
+        self.not_found = 0
+
+    def report(self) -> str:
+        header = ["command", "calls", "errors"] + [f"{p} p50/p99" for p in PHASES]
+        rows = [header]
+        for key, stats in sorted(self.commands.items(), key=lambda i: -i[1].calls):
+            row = [key, str(stats.calls), str(sum(stats.errors.values()))]
+            for phase in PHASES:
+                hist = stats.phases[phase]
+                row.append(f"{_fmt_ns(hist.percentile(50))}/{_fmt_ns(hist.percentile(99))}" if hist.count else "-")
+            rows.append(row)
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+        errors: Dict[str, int] = {}
+        for stats in self.commands.values():
+            for name, count in stats.errors.items():
+                errors[name] = errors.get(name, 0) + count
+        if self.not_found:
+            errors[CommandNotFoundError.__name__] = self.not_found
+        if errors:
+            lines += ["", "errors: " + ", ".join(f"{k}={v}" for k, v in sorted(errors.items()))]
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "not_found": self.not_found,
+            "commands": {key: stats.to_dict() for key, stats in self.commands.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "eggella") -> str:
+        lines = [
+            f"# TYPE {prefix}_command_not_found_total counter",
+            f"{prefix}_command_not_found_total {self.not_found}",
+            f"# TYPE {prefix}_command_calls_total counter",
+        ]
+        lines += [f'{prefix}_command_calls_total{{command="{_label(k)}"}} {s.calls}' for k, s in self.commands.items()]
+        lines.append(f"# TYPE {prefix}_command_errors_total counter")
+        for key, stats in self.commands.items():
+            lines += [
+                f'{prefix}_command_errors_total{{command="{_label(key)}",error="{_label(name)}"}} {count}'
+                for name, count in stats.errors.items()
+            ]
+        lines.append(f"# TYPE {prefix}_command_phase_seconds histogram")
+        for key, stats in self.commands.items():
+            for phase, hist in stats.phases.items():
+                labels = f'command="{_label(key)}",phase="{phase}"'
+                last = max((i for i, c in enumerate(hist.buckets) if c), default=0)
+                cumulative = 0
+                for i in range(last + 1):
+                    cumulative += hist.buckets[i]
+                    le = f"{(1 << i) / 1e9:g}"
+                    lines.append(f'{prefix}_command_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_command_phase_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{prefix}_command_phase_seconds_sum{{{labels}}} {hist.total_ns / 1e9:g}")
+                lines.append(f"{prefix}_command_phase_seconds_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, fmt: str = "json"):
+        """write metrics to local file
+
+        :param path: file path
+        :param fmt: `json` or `prometheus` text format
+        """
+        if fmt == "json":
+            text = json.dumps(self.to_dict(), indent=2)
+        elif fmt == "prometheus":
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Unknown metrics format `{fmt}`")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
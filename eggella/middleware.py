@@ -0,0 +1,126 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from eggella.command.objects import Command
+
+CallNext = Callable[["CommandCall"], Any]
+
+
+class CommandCall:
+    """Command invocation passed through middlewares chain
+
+    :param command: command object
+    :param key: command key
+    :param raw_args: arguments string as typed by user
+    :param args: positional arguments parsed by command handler
+    :param kwargs: keyword arguments parsed by command handler
+    """
+
+    __slots__ = ("command", "key", "raw_args", "args", "kwargs")
+
+    def __init__(self, command: "Command", key: str, raw_args: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        self.command = command
+        self.key = key
+        self.raw_args = raw_args
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f"CommandCall(key={self.key!r}, args={self.args!r}, kwargs={self.kwargs!r})"
+
+
+class Middleware:
+    """Base class of command execution middleware. Override only required hooks: not overridden hooks are
+    excluded from compiled chain
+
+    - before(call) - called before command, can modify `call.args` and `call.kwargs`
+    - around(call, call_next) - wraps next middleware and command, must return `call_next(call)` result
+    - after(call, result) - called after success command execution, returns result (can be replaced)
+    """
+
+    def before(self, call: CommandCall) -> None:
+        pass
+
+    def around(self, call: CommandCall, call_next: CallNext) -> Any:
+        return call_next(call)
+
+    def after(self, call: CommandCall, result: Any) -> Any:
+        return result
+
+
+class FunctionMiddleware(Middleware):
+    """around middleware from function `fn(call, call_next)`"""
+
+    def __init__(self, fn: Callable[[CommandCall, CallNext], Any]):
+        self.fn = fn
+
+    def around(self, call: CommandCall, call_next: CallNext) -> Any:
+        return self.fn(call, call_next)
+
+    def __repr__(self):
+        return f"FunctionMiddleware({self.fn!r})"
+
+
+MiddlewareLike = Union[Middleware, Callable[[CommandCall, CallNext], Any]]
+
+
+def as_middleware(middleware: MiddlewareLike) -> Middleware:
+    if isinstance(middleware, Middleware):
+        return middleware
+    elif callable(middleware):
+        return FunctionMiddleware(middleware)
+    raise TypeError(f"Middleware should be Middleware instance or callable, not {type(middleware).__name__}")
+
+
+def call_command(call: CommandCall) -> Any:
+    """last chain element: execute command function"""
+    return call.command.invoke(call.args, call.kwargs)
+
+
+def _hook(middleware: Middleware, name: str) -> Optional[Callable]:
+    if getattr(type(middleware), name) is getattr(Middleware, name):
+        return None
+    return getattr(middleware, name)
+
+
+def _link(middleware: Middleware, call_next: CallNext) -> CallNext:
+    before, around, after = _hook(middleware, "before"), _hook(middleware, "around"), _hook(middleware, "after")
+    inner = call_next
+    if around is not None:
+
+        def inner(call: CommandCall) -> Any:
+            return around(call, call_next)
+
+    if before is None and after is None:
+        return inner
+    elif after is None:
+
+        def step(call: CommandCall) -> Any:
+            before(call)  # type: ignore[misc]
+            return inner(call)
+
+    elif before is None:
+
+        def step(call: CommandCall) -> Any:
+            return after(call, inner(call))  # type: ignore[misc]
+
+    else:
+
+        def step(call: CommandCall) -> Any:
+            before(call)  # type: ignore[misc]
+            return after(call, inner(call))  # type: ignore[misc]
+
+    return step
+
+
+def compile_chain(middlewares: Sequence[Middleware], terminal: CallNext = call_command) -> Optional[CallNext]:
+    """build single nested callable from middlewares. First middleware is outermost
+
+    :return: None if middlewares is empty
+    """
+    if not middlewares:
+        return None
+    chain = terminal
+    for middleware in reversed(middlewares):
+        chain = _link(middleware, chain)
+    return chain
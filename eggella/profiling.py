@@ -0,0 +1,176 @@
+"""Live profiling of commands: `.profile` (cProfile) and `.mem` (tracemalloc) buildin commands"""
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eggella.middleware import CallNext, CommandCall, Middleware
+
+
+def parse_options(line: str, options: Tuple[str, ...]) -> Tuple[Dict[str, Any], str]:
+    """split leading `-x VALUE` options from command line. `-n` value is int
+
+    :return: options values and rest of line
+    :raise ValueError: unknown option, option without value or empty command line
+    """
+    values: Dict[str, Any] = {}
+    line = line.strip()
+    while line.startswith("-"):
+        option, _, rest = line.partition(" ")
+        if option not in options:
+            raise ValueError(f"unknown option {option}")
+        value, _, line = rest.lstrip().partition(" ")
+        if not value:
+            raise ValueError(f"option {option} requires value")
+        values[option] = int(value) if option == "-n" else value
+        line = line.lstrip()
+    if not line:
+        raise ValueError("pass command line")
+    return values, line
+
+
+def format_stats(stats: pstats.Stats, top: int, sort: str = "cumulative") -> str:
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore[attr-defined]
+    stats.sort_stats(sort).print_stats(top)
+    return stream.getvalue().strip("\n")
+
+
+def profile_call(fn: Callable[[], Any], top: int = 20, path: Optional[str] = None) -> Tuple[Any, str]:
+    """call function under cProfile
+
+    :param top: show top-N entries by cumulative time
+    :param path: save pstats dump to this file
+    :return: function result or raised exception and text report
+    """
+    profiler = cProfile.Profile()
+    result: Any
+    try:
+        result = profiler.runcall(fn)
+    except Exception as e:
+        result = e
+    stats = pstats.Stats(profiler)
+    report = format_stats(stats, top)
+    if path:
+        stats.dump_stats(path)
+        report += f"\nprofile saved to {path}"
+    return result, report
+
+
+def _format_size(size: int) -> str:
+    sign = "-" if size < 0 else "+"
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.0f}{unit}" if unit == "B" else f"{sign}{size:.1f}{unit}"
+        size /= 1024  # type: ignore[assignment]
+    return f"{sign}{size:.1f}GiB"
+
+
+def trace_memory(fn: Callable[[], Any], top: int = 10) -> Tuple[Any, str]:
+    """call function under tracemalloc
+
+    :param top: show top-N allocation sites by net growth
+    :return: function result or raised exception and text report
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    # ignore allocations of profiler itself
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        result: Any
+        try:
+            result = fn()
+        except Exception as e:
+            result = e
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        if started:
+            tracemalloc.stop()
+    diff = [d for d in after.compare_to(before, "lineno") if d.size_diff]
+    lines = [f"net growth {_format_size(sum(d.size_diff for d in diff))}, traced peak {_format_size(peak)[1:]}"]
+    for stat in diff[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{_format_size(stat.size_diff):>10} {stat.count_diff:+7} blocks  {frame.filename}:{frame.lineno}")
+    return result, "\n".join(lines)
+
+
+class SamplingProfiler(Middleware):
+    """Profile every Nth command execution and accumulate stats. Not sampled calls cost one counter increment
+
+    :param every: sampling interval
+    """
+
+    def __init__(self, every: int):
+        if every < 1:
+            raise ValueError("sampling interval should be positive")
+        self.every = every
+        self.calls = 0
+        self.samples = 0
+        self.stats: Optional[pstats.Stats] = None
+
+    def around(self, call: CommandCall, call_next: CallNext) -> Any:
+        # buildin commands (`.profile`, `.stats`, ...) are not sampled
+        if call.key.startswith("."):
+            return call_next(call)
+        self.calls += 1
+        if self.calls % self.every:
+            return call_next(call)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(call_next, call)
+        finally:
+            self.samples += 1
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def report(self, top: int = 20) -> str:
+        header = f"sampling every {self.every} commands: {self.samples} of {self.calls} calls profiled"
+        if self.stats is None:
+            return header
+        return f"{header}\n{format_stats(self.stats, top)}"
+
+    def save(self, path: str) -> str:
+        if self.stats is None:
+            return "no samples"
+        self.stats.dump_stats(path)
+        return f"profile saved to {os.path.abspath(path)}"
+
+
+def sample_command(manager: Any, args: List[str]) -> str:
+    """`.profile sample` subcommands: enable, report, save and disable sampling middleware"""
+    sampler = next((mw for mw in manager.middlewares if isinstance(mw, SamplingProfiler)), None)
+    if not args:
+        return sampler.report() if sampler else "sampling disabled"
+    action, *rest = args
+    if action == "off":
+        if sampler is None:
+            return "sampling disabled"
+        manager.middlewares.remove(sampler)
+        manager.compile_middlewares()
+        return sampler.report()
+    elif action == "save":
+        if sampler is None:
+            return "sampling disabled"
+        if not rest:
+            raise ValueError("pass pstats file path")
+        return sampler.save(rest[0])
+    if not action.isdigit() or int(action) < 1:
+        raise ValueError(f"expected sampling interval, `save` or `off`, got {action}")
+    every = int(action)
+    if sampler is not None:
+        sampler.every = every
+    else:
+        # outermost: profile whole middlewares chain
+        manager.middlewares.insert(0, SamplingProfiler(every))
+        manager.compile_middlewares()
+    return f"profile every {every} command"
@@ -0,0 +1,213 @@
+import importlib
+import inspect
+import os
+import sys
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+    from eggella.command.objects import Command
+    from eggella.fsm.fsm import Fsm
+    from eggella.manager import BlueprintManager
+
+
+def _fn_fingerprint(fn: Callable) -> Tuple[Any, ...]:
+    closure = getattr(fn, "__closure__", None) or ()
+    try:
+        cells = repr([cell.cell_contents for cell in closure])
+    except ValueError:  # empty cell
+        cells = ""
+    return (
+        getattr(fn, "__code__", fn),
+        repr(getattr(fn, "__defaults__", None)),
+        repr(getattr(fn, "__kwdefaults__", None)),
+        repr(getattr(fn, "__annotations__", None)),
+        cells,
+    )
+
+
+def _command_fingerprint(command: "Command") -> Tuple[Any, ...]:
+    return (
+        _fn_fingerprint(command.fn),
+        command.short_description,
+        command.usage,
+        command.is_visible,
+        repr(command.nested_completions),
+        repr(command.nested_meta),
+        type(command.handler),
+        command.cache and command.cache.policy,
+    )
+
+
+def _fsm_fingerprint(fsm: "Fsm") -> Tuple[Any, ...]:
+    return tuple(fsm._all_states), tuple((state, _fn_fingerprint(fn)) for state, fn in fsm.handlers.items())
+
+
+def _module_mtime(module: ModuleType) -> Optional[int]:
+    try:
+        return os.stat(module.__file__).st_mtime_ns  # type: ignore[arg-type]
+    except (OSError, TypeError):
+        return None
+
+
+class BlueprintReloader:
+    """Re-import changed blueprints modules and swap only changed commands, FSM groups and events in main app"""
+
+    def __init__(self, manager: "BlueprintManager"):
+        self.manager = manager
+        # blueprint app name: (blueprint, module, module mtime)
+        self._tracked: Dict[str, Tuple["Eggella", ModuleType, Optional[int]]] = {}
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def find_module(blueprint: "Eggella") -> Optional[ModuleType]:
+        """find module, where blueprint application created"""
+        functions: List[Callable] = [c.fn for c in blueprint.command_manager.commands.values()]
+        functions += blueprint.event_manager.startup_events + blueprint.event_manager.close_events
+        candidates = [sys.modules.get(getattr(fn, "__module__", None) or "") for fn in functions]
+        # fallback: slow scan all modules
+        candidates += list(sys.modules.values())
+        for module in candidates:
+            if module is None or module.__name__ == "__main__":
+                continue
+            if any(value is blueprint for value in list(vars(module).values())):
+                return module
+        return None
+
+    def track(self, blueprint: "Eggella"):
+        if module := self.find_module(blueprint):
+            self._tracked[blueprint.app_name] = (blueprint, module, _module_mtime(module))
+
+    def changed(self) -> List[str]:
+        return [name for name, (_, module, mtime) in self._tracked.items() if _module_mtime(module) != mtime]
+
+    # watcher
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def watch(self, interval: float = 1.0):
+        """start polling thread, which marks changed modules. Changes applied before next command execution"""
+        if self._watcher and self._watcher.is_alive():
+            return
+
+        def poll():
+            while not self._stop.wait(interval):
+                if changed := self.changed():
+                    with self._lock:
+                        self._pending.update(changed)
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=poll, name="eggella-blueprints-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # reload
+    def reload(self, force: bool = False) -> List[str]:
+        """reload changed blueprints modules
+
+        :param force: reload all tracked blueprints
+        :return: report lines
+        """
+        with self._lock:
+            self._pending.clear()
+        names = list(self._tracked) if force else self.changed()
+        return [self._reload_blueprint(name) for name in names]
+
+    def _reload_blueprint(self, name: str) -> str:
+        blueprint, module, _ = self._tracked[name]
+        # Eggella app is singleton by name: module re-import re-initializes same object with new managers
+        old_state = (
+            blueprint._command_manager,
+            blueprint._event_manager,
+            blueprint._blueprint_manager,
+            blueprint.fsm,
+            blueprint.CTX,
+        )
+        try:
+            module = importlib.reload(module)
+        except Exception as e:
+            self._restore(blueprint, old_state)
+            self._tracked[name] = (blueprint, module, _module_mtime(module))
+            return f"{name}: reload failed ({e!r})"
+        blueprint.CTX = old_state[4]
+        self._tracked[name] = (blueprint, module, _module_mtime(module))
+        old_commands, old_events, _, old_fsm, _ = old_state
+        return f"{name}: " + ", ".join(
+            (
+                self._swap_commands(blueprint, old_commands.commands),
+                self._swap_fsm(blueprint, old_fsm.fsm_storage),
+                self._swap_events(blueprint, old_events),
+            )
+        )
+
+    @staticmethod
+    def _restore(blueprint: "Eggella", state):
+        (
+            blueprint._command_manager,
+            blueprint._event_manager,
+            blueprint._blueprint_manager,
+            blueprint.fsm,
+            blueprint.CTX,
+        ) = state
+
+    def _swap_commands(self, blueprint: "Eggella", old: Dict[str, "Command"]) -> str:
+        main = self.manager.app.command_manager
+        new = blueprint.command_manager.commands
+        added, changed, removed = [], [], []
+        for key in old.keys() - new.keys():
+            if main.commands.get(key) is old[key]:
+                del main.commands[key]
+            removed.append(key)
+        for key, command in new.items():
+            if key not in old:
+                main.commands[key] = command
+                added.append(key)
+            elif _command_fingerprint(command) != _command_fingerprint(old[key]):
+                main.commands[key] = command
+                changed.append(key)
+            else:
+                # keep warm command object (cached metadata)
+                new[key] = old[key]
+        for key in (*changed, *removed):
+            main.error_handlers.pop(inspect.unwrap(old[key].fn), None)
+        main.error_handlers.update(blueprint.command_manager.error_handlers)
+        main.invalidate(*added, *changed, *removed)
+        return f"commands +{len(added)} ~{len(changed)} -{len(removed)}"
+
+    def _swap_fsm(self, blueprint: "Eggella", old: Dict[str, "Fsm"]) -> str:
+        main = self.manager.app.fsm.fsm_storage
+        new = blueprint.fsm.fsm_storage
+        swapped = 0
+        for key in old.keys() - new.keys():
+            if main.get(key) is old[key]:
+                del main[key]
+                swapped += 1
+        for key, fsm in new.items():
+            if key in old and _fsm_fingerprint(fsm) == _fsm_fingerprint(old[key]):
+                new[key] = old[key]
+            else:
+                main[key] = fsm
+                swapped += 1
+        return f"fsm ~{swapped}"
+
+    def _swap_events(self, blueprint: "Eggella", old_events) -> str:
+        main = self.manager.app.event_manager
+        new_events = blueprint.event_manager
+        swapped = 0
+        for attr in ("startup_events", "close_events"):
+            old_list, new_list, main_list = getattr(old_events, attr), getattr(new_events, attr), getattr(main, attr)
+            if [_fn_fingerprint(ev) for ev in old_list] == [_fn_fingerprint(ev) for ev in new_list]:
+                new_list[:] = old_list
+                continue
+            old_ids = {id(ev) for ev in old_list}
+            main_list[:] = [ev for ev in main_list if id(ev) not in old_ids] + new_list
+            swapped += 1
+        return f"events ~{swapped}"
@@ -0,0 +1,85 @@
+import shlex
+import sys
+from types import GeneratorType
+from typing import TYPE_CHECKING, List, Optional, TextIO
+
+from eggella.exceptions import get_exit_code
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+
+
+def run_line(app: "Eggella", line: str, stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None) -> int:
+    """Execute one command line without TTY and events. Print result as plain text
+
+    :param app: prepared Eggella application
+    :param line: command line
+    :param stdout: result output stream. Default `sys.stdout`
+    :param stderr: errors output stream. Default `sys.stderr`
+    :return: exit code
+    """
+    key, args = app._split_line(line)
+    if not key:
+        return 0
+    return run_command(app, key, args, stdout, stderr)
+
+
+def run_command(
+    app: "Eggella", key: str, args: str, stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None
+) -> int:
+    """Execute command by key with raw arguments string. Print result as plain text
+
+    :return: exit code
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    if app.output_format == "jsonl":
+        return _run_command_jsonl(app, key, args, stdout)
+    try:
+        result = app.command_manager.exec(key, args)
+        if isinstance(result, GeneratorType):
+            for item in result:
+                print(item, file=stdout, flush=True)
+        elif result is not None:
+            print(result, file=stdout, flush=True)
+    except (Exception, KeyboardInterrupt) as exc:
+        print(f"Error! `{key}`: {exc}", file=stderr, flush=True)
+        return get_exit_code(exc)
+    return 0
+
+
+def _run_command_jsonl(app: "Eggella", key: str, args: str, stdout: TextIO) -> int:
+    """write result or error as JSON lines to stdout"""
+    from eggella.events.jsonl import error_record, write_record, write_result
+    from eggella.manager import ERROR_EVENTS
+
+    try:
+        result = app.command_manager.exec(key, args)
+    except (Exception, KeyboardInterrupt) as exc:
+        # same records as REPL mode JSON events
+        write_record(error_record(ERROR_EVENTS.get(type(exc)), key, args, exc), stdout)
+        return get_exit_code(exc)
+    if write_error := write_result(result, stdout):
+        return get_exit_code(write_error)
+    return 0
+
+
+def run_argv(app: "Eggella", argv: List[str]) -> int:
+    """Execute one command from command line arguments. Without arguments print help.
+    `--jsonl` first argument switches output to JSON lines
+
+    :param app: Eggella application
+    :param argv: command key and arguments
+    :return: exit code
+    """
+    if argv and argv[0] == "--jsonl":
+        app.output_format = "jsonl"
+        argv = argv[1:]
+    app._prepare()
+    app._handle_startup_events()
+    try:
+        if not argv:
+            return run_command(app, "help", "")
+        return run_command(app, argv[0], shlex.join(argv[1:]))
+    finally:
+        app._handle_close_events()
@@ -1,77 +1,192 @@
 import os
 import sys
-from typing import Callable, Union
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterator, Optional, Set, Union
 
-from prompt_toolkit import print_formatted_text, prompt
-from prompt_toolkit.formatted_text import merge_formatted_text
-from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
-from prompt_toolkit.keys import Keys
-from prompt_toolkit.shortcuts.prompt import PromptSession, confirm
-
-E = KeyPressEvent
+# prompt_toolkit imported on first usage: application may run without REPL
+if TYPE_CHECKING:
+    from prompt_toolkit.key_binding import KeyPressEvent as E
+    from prompt_toolkit.keys import Keys
+    from prompt_toolkit.shortcuts.prompt import PromptSession
 
 
 def create_confirm_session_2(
     message: str,
     suffix: str = " ([y]/n) ",
-    default_key: Union[str, Keys] = Keys.Enter,
+    default_key: Union[str, "Keys"] = "c-m",  # Keys.Enter
     default_value: bool = True,
-) -> PromptSession[bool]:
+) -> "PromptSession[bool]":
+    from prompt_toolkit.formatted_text import merge_formatted_text
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.keys import Keys
+    from prompt_toolkit.shortcuts.prompt import PromptSession
+
     bindings = KeyBindings()
 
     @bindings.add("y")
     @bindings.add("Y")
-    def yes(event: E) -> None:
+    def yes(event: "E") -> None:
         session.default_buffer.text = "y"
         event.app.exit(result=True)
 
     @bindings.add("д")
     @bindings.add("Д")
-    def yes_cyrillic(event: E) -> None:
+    def yes_cyrillic(event: "E") -> None:
         session.default_buffer.text = "д"
         event.app.exit(result=True)
 
     @bindings.add("n")
     @bindings.add("N")
-    def no(event: E) -> None:
+    def no(event: "E") -> None:
         session.default_buffer.text = "n"
         event.app.exit(result=False)
 
     @bindings.add("н")
     @bindings.add("Н")
-    def no_cyrillic(event: E) -> None:
+    def no_cyrillic(event: "E") -> None:
         session.default_buffer.text = "н"
         event.app.exit(result=False)
 
     @bindings.add(default_key)
-    def _default(event: E) -> None:
+    def _default(event: "E") -> None:
         event.app.exit(result=default_value)
 
     @bindings.add(Keys.Any)
-    def _(__: E) -> None:
+    def _(__: "E") -> None:
         pass
 
     complete_message = merge_formatted_text([message, suffix])
-    session: PromptSession[bool] = PromptSession(complete_message, key_bindings=bindings)
+    session: "PromptSession[bool]" = PromptSession(complete_message, key_bindings=bindings)
     return session
 
 
+class SessionPool:
+    """LRU pool of reusable prompt sessions. Session creation (layout, key bindings, renderer) is the most
+    expensive part of prompt call, pooled sessions are created once per configuration and terminal.
+
+    Per-call arguments (message, completer, validator, ...) override session fields only for this call:
+    fields are restored after prompt, next call starts with same defaults as new session
+
+    :param maxsize: max pooled sessions
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._sessions: "OrderedDict[Hashable, PromptSession[Any]]" = OrderedDict()
+        # ids of pooled sessions claimed by `get()` and not released yet
+        self._busy: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def get(self, config: Hashable, factory: Callable[[], "PromptSession[Any]"]) -> "PromptSession[Any]":
+        """claim idle pooled session for configuration or create it by factory. Return it by `release()`
+
+        :param config: hashable session configuration key
+        :param factory: create new session
+        """
+        from prompt_toolkit.application import get_app_session
+
+        app_session = get_app_session()
+        # renderer is bound to output, input is replaced on reuse (pipe inputs are created per run)
+        key = (config, id(app_session.output))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and id(session) not in self._busy and not session.app.is_running:
+                self._busy.add(id(session))
+                self._sessions.move_to_end(key)
+                session.app.input = app_session.input
+                return session
+        new_session = factory()
+        with self._lock:
+            # else: pooled session is busy (other thread or nested prompt), new session is not pooled
+            if key not in self._sessions:
+                self._sessions[key] = new_session
+                self._busy.add(id(new_session))
+                while len(self._sessions) > self.maxsize:
+                    self._sessions.popitem(last=False)
+        return new_session
+
+    def release(self, session: "PromptSession[Any]"):
+        """return session claimed by `get()` to pool"""
+        with self._lock:
+            self._busy.discard(id(session))
+
+    @contextmanager
+    def claim(self, config: Hashable, factory: Callable[[], "PromptSession[Any]"]) -> Iterator["PromptSession[Any]"]:
+        session = self.get(config, factory)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    @staticmethod
+    def run(session: "PromptSession[Any]", message: Any = None, **kwargs: Any) -> Any:
+        """prompt pooled session and reset per-call overrides"""
+        saved = {name: getattr(session, name) for name in session._fields}
+        try:
+            return session.prompt(message, **kwargs)
+        finally:
+            for name, value in saved.items():
+                setattr(session, name, value)
+
+    def prompt(self, message: Any = None, *, history: Optional[Any] = None, **kwargs: Any) -> str:
+        """drop-in replacement of `prompt_toolkit.prompt` on pooled sessions"""
+        from prompt_toolkit.history import InMemoryHistory
+        from prompt_toolkit.shortcuts.prompt import PromptSession
+
+        with self.claim(("prompt", id(history)), lambda: PromptSession(history=history)) as session:
+            if history is None:
+                # every call without history starts with empty one, like new session: input is not recalled by next
+                # prompt (buffer reloads history on reset)
+                session.history = session.default_buffer.history = InMemoryHistory()
+            return self.run(session, message, **kwargs)
+
+    def confirm(self, message: str = "Confirm?", suffix: str = " (y/n) ") -> bool:
+        """drop-in replacement of `prompt_toolkit.shortcuts.confirm` on pooled sessions"""
+        from prompt_toolkit.shortcuts.prompt import create_confirm_session
+
+        with self.claim(("confirm", message, suffix), lambda: create_confirm_session(message, suffix)) as session:
+            return session.prompt()
+
+    def yes_no_exit(self, message: str = "Do you really want to exit?") -> bool:
+        with self.claim(("yes_no_exit", message), lambda: create_confirm_session_2(message)) as session:
+            return session.prompt()
+
+
+SESSION_POOL = SessionPool()
+
+
 def yes_no_exit(message: str = "Do you really want to exit?"):
-    return create_confirm_session_2(message).prompt()
+    return SESSION_POOL.yes_no_exit(message)
 
 
 class CmdShortCuts:
+    """prompt_toolkit shortcuts. `prompt` and `confirm` reuse sessions from pool"""
+
+    def __init__(self, pool: SessionPool = SESSION_POOL):
+        self.pool = pool
+
     @property
     def prompt(self) -> Callable:
-        return prompt
+        return self.pool.prompt
 
     @property
     def print_ft(self) -> Callable:
+        from prompt_toolkit import print_formatted_text
+
         return print_formatted_text
 
     @property
     def confirm(self) -> Callable:
-        return confirm
+        return self.pool.confirm
 
     @staticmethod
     def clear() -> None:
@@ -1,15 +1,5 @@
 from typing import TYPE_CHECKING, Iterable
 
-# https://github.com/prompt-toolkit/python-prompt-toolkit/blob/master/examples/full-screen/pager.py
-from prompt_toolkit.application import Application
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.layout.containers import HSplit, Window
-from prompt_toolkit.layout.controls import FormattedTextControl
-from prompt_toolkit.layout.dimension import LayoutDimension as D
-from prompt_toolkit.layout.layout import Layout
-from prompt_toolkit.styles import Style
-from prompt_toolkit.widgets import SearchToolbar, TextArea
-
 if TYPE_CHECKING:
     from eggella import Eggella
     from eggella.command.objects import Command
@@ -65,6 +55,16 @@ def _render_man_text(app: "Eggella", commands: Iterable["Command"]):
 
 
 def gen_man_pager(app: "Eggella"):
+    # https://github.com/prompt-toolkit/python-prompt-toolkit/blob/master/examples/full-screen/pager.py
+    from prompt_toolkit.application import Application
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.layout.containers import HSplit, Window
+    from prompt_toolkit.layout.controls import FormattedTextControl
+    from prompt_toolkit.layout.dimension import LayoutDimension as D
+    from prompt_toolkit.layout.layout import Layout
+    from prompt_toolkit.styles import Style
+    from prompt_toolkit.widgets import SearchToolbar, TextArea
+
     commands = app.command_manager.commands.values()
     text = _render_man_text(app, commands)
     search_field = SearchToolbar(text_if_not_searching=[("class:not-searching", "Press '/' to start searching.")])
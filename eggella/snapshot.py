@@ -0,0 +1,156 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from eggella.manager import CommandManager
+
+# increase on snapshot layout change
+_SNAPSHOT_FORMAT = 2
+# header size prefix: header (validation key) is read on startup, body - on first index usage
+_HEADER_SIZE = struct.Struct("<I")
+
+
+class RegistrySnapshot:
+    """On-disk snapshot of derived commands registry indexes: commands metadata (signature arguments and docstrings),
+    top level completions and suggestion candidates.
+
+    Snapshot is valid while source modules of commands, commands registration parameters, eggella and python versions
+    are not changed. Startup reads only the validation header, indexes are unmarshalled from read-only memory map
+    on first usage. On mismatch indexes are rebuilt lazily by commands and snapshot is written by `save()`.
+
+    :param path: snapshot file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # registry version (`CommandManager.registry_version`) indexes are valid for
+        self.version: Optional[Tuple[int, int]] = None
+        self._manager: Optional["CommandManager"] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._body_offset = 0
+        self._body: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def source_key(manager: "CommandManager") -> str:
+        from eggella import __version__
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{_SNAPSHOT_FORMAT}:{__version__}:{sys.version}".encode())
+        modules = set()
+        for key, command in manager.commands.items():
+            # programmatically registered commands: descriptions are not in module source
+            fields = (key, command.short_description, command.usage, command.is_visible, command.is_lazy)
+            digest.update("\0".join(map(str, fields)).encode() + b"\n")
+            if not command.is_lazy:
+                modules.add(getattr(command.fn, "__module__", None))
+        for module_name in sorted(filter(None, modules)):
+            file = getattr(sys.modules.get(module_name), "__file__", None)
+            if file and os.path.isfile(file):
+                st = os.stat(file)
+                digest.update(f"{module_name}:{file}:{st.st_mtime_ns}:{st.st_size}".encode())
+            else:
+                digest.update(f"{module_name}:-".encode())
+        return digest.hexdigest()
+
+    def _open(self, key: str) -> bool:
+        """map snapshot file and check validation header"""
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            (size,) = _HEADER_SIZE.unpack_from(mm)
+            header = marshal.loads(mm[_HEADER_SIZE.size : _HEADER_SIZE.size + size])
+            if isinstance(header, dict) and header.get("key") == key:
+                self._mm = mm
+                self._body_offset = _HEADER_SIZE.size + size
+                return True
+        except (struct.error, ValueError, EOFError, TypeError):
+            pass
+        mm.close()
+        return False
+
+    def _load_body(self) -> Dict[str, Any]:
+        if self._body is None:
+            body: Any = None
+            if self._mm is not None:
+                view = memoryview(self._mm)
+                body_view = view[self._body_offset :]
+                try:
+                    body = marshal.loads(body_view)
+                except (ValueError, EOFError, TypeError):
+                    body = None
+                finally:
+                    body_view.release()
+                    view.release()
+                    self._mm.close()
+                    self._mm = None
+            self._body = body if isinstance(body, dict) else {}
+            self._apply_metadata()
+        return self._body
+
+    def _apply_metadata(self):
+        manager = self._manager
+        if manager is None or not self.is_valid(manager):
+            return
+        for key, (arguments, docstring) in self._body.get("commands", {}).items():  # type: ignore[union-attr]
+            command = manager.commands.get(key)
+            if command is not None and not command.is_lazy and command._arguments is None:
+                command._arguments, command._docstring = [sys.intern(arg) for arg in arguments], docstring
+
+    def is_valid(self, manager: "CommandManager") -> bool:
+        """indexes match current commands registry"""
+        return self.version is not None and self.version == manager.registry_version
+
+    @property
+    def completions(self) -> List[Tuple[str, str]]:
+        return self._load_body().get("completions", [])
+
+    @property
+    def suggestions(self) -> List[str]:
+        return self._load_body().get("suggestions", [])
+
+    def load_metadata(self):
+        """apply commands metadata from snapshot"""
+        self._load_body()
+
+    def apply(self, manager: "CommandManager") -> bool:
+        """attach snapshot to commands manager, if it is valid. Indexes are loaded on first usage
+
+        :return: True if snapshot used. Else call `save()` after indexes are built
+        """
+        self._manager = manager
+        if self._open(self.source_key(manager)):
+            self.version = manager.registry_version
+            manager.snapshot = self
+            return True
+        return False
+
+    def save(self, manager: "CommandManager"):
+        """build registry indexes and write snapshot"""
+        body = {
+            "commands": {
+                cmd_key: (tuple(command.arguments), command.docstring)
+                for cmd_key, command in manager.commands.items()
+                if not command.is_lazy
+            },
+            "completions": manager.all_completions,
+            "suggestions": manager.suggestion_candidates,
+        }
+        header = marshal.dumps({"key": self.source_key(manager)})
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER_SIZE.pack(len(header)))
+                f.write(header)
+                marshal.dump(body, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,182 @@
+"""Headless driver for scripted sessions: tests, CI and benchmarks without terminal"""
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+from prompt_toolkit.application import create_app_session, get_app_or_none
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
+    from eggella.app import Eggella
+
+_MISSING = object()
+EVENTS = (
+    "kb_interrupt_event",
+    "eof_event",
+    "command_error_event",
+    "command_not_found_event",
+    "command_complete_event",
+    "command_suggest_event",
+    "command_many_args_err_event",
+    "command_argument_value_err_event",
+    "command_runtime_err_event",
+    "fsm_kb_interrupt_event",
+    "fsm_eof_error_event",
+)
+
+
+@dataclass
+class Record:
+    """
+    :param kind: `output` - printed text, `event` - fired event
+    :param name: event name
+    :param value: printed text or event arguments
+    """
+
+    kind: Literal["output", "event"]
+    name: str
+    value: Any
+
+
+@dataclass
+class SessionResult:
+    records: List[Record] = field(default_factory=list)
+
+    @property
+    def output(self) -> str:
+        """all printed text"""
+        return "".join(r.value for r in self.records if r.kind == "output")
+
+    @property
+    def events(self) -> List[Tuple[str, Tuple[Any, ...]]]:
+        return [(r.name, r.value) for r in self.records if r.kind == "event"]
+
+    @property
+    def results(self) -> List[Any]:
+        """success commands results"""
+        return [r.value[0] for r in self.records if r.kind == "event" and r.name == "command_complete_event"]
+
+    def event_names(self) -> List[str]:
+        return [r.name for r in self.records if r.kind == "event"]
+
+
+class CaptureOutput(DummyOutput):
+    """Dummy terminal output, which records printed text. Prompts rendering is ignored"""
+
+    def __init__(self, result: SessionResult):
+        self.result = result
+
+    def write(self, data: str) -> None:
+        if get_app_or_none() is None:
+            self.result.records.append(Record("output", "", data))
+
+    write_raw = write
+
+
+class _StdoutCapture:
+    def __init__(self, result: SessionResult):
+        self.result = result
+
+    def write(self, data: str) -> int:
+        if data:
+            self.result.records.append(Record("output", "", data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class EggellaTestClient:
+    """Run application sessions through pipe input and dummy output.
+    Records printed output and fired events
+
+    USAGE:
+        client = EggellaTestClient(app)
+        result = client.run("add 1 2", "form", "answer")
+        assert result.results == [3]
+
+    :param app: Eggella application
+    """
+
+    def __init__(self, app: "Eggella"):
+        self.app = app
+        self._output = CaptureOutput(SessionResult())
+        # prompt session is created once: sessions creation is the most expensive part of run
+        self._session: Optional["PromptSession"] = None
+
+    @contextmanager
+    def _recording(self, result: SessionResult) -> Iterator[None]:
+        manager = self.app.event_manager
+        # instance attributes to restore: default events are class level descriptors
+        saved: Dict[str, Any] = {name: manager.__dict__.get(name, _MISSING) for name in EVENTS}
+        for name in EVENTS:
+            manager.__dict__[name] = self._recorder(result, name, getattr(manager, name))
+        try:
+            with redirect_stdout(_StdoutCapture(result)):  # type: ignore[type-var]
+                yield
+        finally:
+            for name, value in saved.items():
+                if value is _MISSING:
+                    manager.__dict__.pop(name, None)
+                else:
+                    manager.__dict__[name] = value
+
+    @staticmethod
+    def _recorder(result: SessionResult, name: str, event: Optional[Any]):
+        if event is None:
+            return None
+
+        def record(*args):
+            result.records.append(Record("event", name, args))
+            # end of scripted input: stop session and active FSM without exit confirm
+            if name in ("eof_event", "fsm_eof_error_event"):
+                return True
+            return event(*args)
+
+        return record
+
+    def run(self, *lines: str, keys: str = "") -> SessionResult:
+        """run application loop session: startup events, commands input, close events.
+        Session ends on input end
+
+        :param lines: input lines, Enter is sent after every line
+        :param keys: raw key sequences sent after lines (VT100 encoded: `\\t` - Tab, `\\x03` - Ctrl+C)
+        """
+        result = self._output.result = SessionResult()
+        app = self.app
+        session = app._session
+        try:
+            with create_pipe_input() as pipe, create_app_session(input=pipe, output=self._output):
+                pipe.send_text("".join(f"{line}\r" for line in lines) + keys)
+                pipe.close()
+                if self._session is None:
+                    app._session = None
+                    self._session = app.session
+                else:
+                    # prompt application binds to input on creation
+                    self._session.app.input = pipe
+                    app._session = self._session
+                with self._recording(result):
+                    app._prepare()
+                    app._handle_startup_events()
+                    app._handle_commands()
+                    app._handle_close_events()
+        finally:
+            app._session = session
+            if app.fsm.is_active():
+                app.fsm.finish()
+        return result
+
+    def execute(self, line: str) -> SessionResult:
+        """execute one command line without prompt"""
+        result = SessionResult()
+        app = self.app
+        app._prepare()
+        key, args = app._split_line(line)
+        self._output.result = result
+        with create_app_session(input=None, output=self._output), self._recording(result):
+            app._dispatch(key, args)
+        return result
@@ -1,10 +1,15 @@
 import inspect
 import sys
-from typing import Any, Type, Union, get_args, get_origin
+from enum import Enum
+from typing import Any, Literal, Type, Union, get_args, get_origin
 
 NoneType = type(None)
 
 
+def _is_enum(type_hint: Type) -> bool:
+    return inspect.isclass(type_hint) and issubclass(type_hint, Enum)
+
+
 class TypeCaster:
     @classmethod
     def _typing_to_builtin(cls, type_hint: Type) -> Type:
@@ -32,7 +37,9 @@ class TypeCaster:
         if value is None and type_hint is not bool:
             return value
 
-        if origin is not None and args:
+        if origin is Literal:
+            return cls._cast_literal(args, value)
+        elif origin is not None and args:
             # list
             if origin is list:
                 return [cls.cast(type_hint=args[0], value=v) for v in value]
@@ -55,6 +62,27 @@ class TypeCaster:
         # bool cast
         elif type_hint is bool:
             return bool(value)
+        elif _is_enum(type_hint):
+            return cls._cast_enum(type_hint, value)
         else:
             # direct cast
             return type_hint(value)
+
+    @staticmethod
+    def _cast_literal(choices: Any, value: Any) -> Any:
+        for choice in choices:
+            if value == choice or str(value) == str(choice):
+                return choice
+        raise ValueError(f"invalid literal for {choices!r}: {value!r}")
+
+    @staticmethod
+    def _cast_enum(enum: Type[Enum], value: Any) -> Any:
+        if isinstance(value, enum):
+            return value
+        # by value, then by member name
+        for member in enum:
+            if value == member.value or str(value) == str(member.value):
+                return member
+        if by_name := enum.__members__.get(str(value)):
+            return by_name
+        raise ValueError(f"invalid literal for {enum.__name__}: {value!r}")
@@ -0,0 +1,230 @@
+"""Record application sessions to JSONL trace and replay them with timings diff.
+
+USAGE:
+    python -m eggella.trace MODULE:APP TRACE [--pace] [-o REPORT]
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from eggella.metrics import PHASES
+
+if TYPE_CHECKING:
+    from eggella.app import Eggella
+
+TRACE_VERSION = 1
+# entry timings: tokenize, cast, execute phases and total time with events handling
+TIMINGS = (*PHASES, "total")
+
+
+class TraceRecorder:
+    """Append-only JSONL trace of entered commands.
+
+    First line is header: `{"v": 1, "app": ..., "eggella": ..., "start": epoch}`,
+    next lines are entries:
+    `{"t": offset_s, "l": line, "k": key, "p": [tokenize, cast, execute], "w": total, "o": outcome}`,
+    timings in nanoseconds, outcome is called event name. Every entry is flushed
+
+    :param path: trace file path
+    :param app_name: application name, written to header
+    """
+
+    def __init__(self, path: str, app_name: str = ""):
+        from eggella import __version__
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        self._start = time.monotonic()
+        self._write({"v": TRACE_VERSION, "app": app_name, "eggella": __version__, "start": time.time()})
+
+    def _write(self, entry: Dict[str, Any]):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def record(self, app: "Eggella", line: str, key: str, args: str) -> str:
+        """dispatch command and write trace entry
+
+        :return: called event name
+        """
+        offset = time.monotonic() - self._start
+        timings = [0, 0, 0]
+        start = time.perf_counter_ns()
+        outcome = app._dispatch(key, args, timings)
+        total = time.perf_counter_ns() - start
+        self._write({"t": round(offset, 6), "l": line, "k": key, "p": timings, "w": total, "o": outcome})
+        return outcome
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """read trace file
+
+    :return: header and entries
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or "v" not in lines[0]:
+        raise ValueError(f"{path} is not eggella trace")
+    if lines[0]["v"] != TRACE_VERSION:
+        raise ValueError(f"unsupported trace version {lines[0]['v']}")
+    # appended sessions: every session starts with own header
+    return lines[0], [line for line in lines if "v" not in line]
+
+
+def _percentile(values: List[int], q: float) -> int:
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def _timings(entry: Dict[str, Any]) -> Iterator[Tuple[str, int]]:
+    yield from zip(PHASES, entry["p"])
+    yield "total", entry["w"]
+
+
+class TraceReplayer:
+    """Replay recorded trace against application without terminal: same commands lines,
+    with or without original pacing. Output is suppressed, active FSM is finished after every command
+
+    :param app: Eggella application
+    """
+
+    def __init__(self, app: "Eggella"):
+        self.app = app
+
+    def _dispatch(self, key: str, args: str, timings: List[int]) -> str:
+        try:
+            return self.app._dispatch(key, args, timings)
+        except (EOFError, KeyboardInterrupt) as e:
+            # FSM states or commands prompts has no input in replay
+            return type(e).__name__
+        finally:
+            if self.app.fsm.is_active():
+                self.app.fsm.finish()
+
+    def replay(self, path: str, pace: bool = False) -> Dict[str, Any]:
+        """replay trace file
+
+        :param path: trace file path
+        :param pace: keep original delays between commands
+        :return: report: p50/p99 of original and replayed phases per command and overall, outcomes mismatches
+        """
+        from prompt_toolkit.application import create_app_session
+        from prompt_toolkit.input import DummyInput
+        from prompt_toolkit.output import DummyOutput
+
+        header, entries = read_trace(path)
+        app = self.app
+        app._prepare()
+        replayed = []
+        start = time.monotonic()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            with create_app_session(input=DummyInput(), output=DummyOutput()):
+                for entry in entries:
+                    if pace and (delay := entry["t"] - (time.monotonic() - start)) > 0:
+                        time.sleep(delay)
+                    key, args = app._split_line(entry["l"])
+                    timings = [0, 0, 0]
+                    begin = time.perf_counter_ns()
+                    outcome = self._dispatch(key, args, timings)
+                    total = time.perf_counter_ns() - begin
+                    replayed.append(
+                        {"t": entry["t"], "l": entry["l"], "k": key, "p": timings, "w": total, "o": outcome}
+                    )
+        return self.report(header, entries, replayed)
+
+    @staticmethod
+    def report(
+        header: Dict[str, Any], original: List[Dict[str, Any]], replayed: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        groups: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+        for name, entries in (("original", original), ("replay", replayed)):
+            for entry in entries:
+                for key in ("*", entry["k"]):
+                    phases = groups.setdefault(key, {}).setdefault(name, {t: [] for t in TIMINGS})
+                    for phase, ns in _timings(entry):
+                        phases[phase].append(ns)
+
+        commands = {}
+        for key, runs in groups.items():
+            stats: Dict[str, Any] = {"count": len(runs["original"]["total"])}
+            for phase in TIMINGS:
+                row = stats[phase] = {}
+                for name in ("original", "replay"):
+                    values = runs[name][phase]
+                    row[f"{name}_p50_ns"] = _percentile(values, 50)
+                    row[f"{name}_p99_ns"] = _percentile(values, 99)
+                # replay / original ratio: > 1 is regression
+                original_p50 = row["original_p50_ns"]
+                row["p50_ratio"] = round(row["replay_p50_ns"] / original_p50, 3) if original_p50 else None
+            commands[key] = stats
+        mismatches = [
+            {"index": i, "line": orig["l"], "original": orig["o"], "replay": new["o"]}
+            for i, (orig, new) in enumerate(zip(original, replayed))
+            if orig["o"] != new["o"]
+        ]
+        return {
+            "app": header.get("app"),
+            "recorded_with": header.get("eggella"),
+            "entries": len(original),
+            "overall": commands.pop("*", {}),
+            "commands": commands,
+            "mismatches": mismatches,
+        }
+
+
+def load_app(target: str) -> "Eggella":
+    """import application by `module:attribute` string"""
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr or "app")
+
+
+def _format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{report['entries']} commands replayed, {len(report['mismatches'])} outcomes mismatches"]
+    rows = [("*", report["overall"])] if report["overall"] else []
+    rows.extend(sorted(report["commands"].items()))
+    for key, stats in rows:
+        total = stats["total"]
+        lines.append(
+            f"{key:<20} n={stats['count']:<6} p50 {total['original_p50_ns'] / 1000:.1f}us -> "
+            f"{total['replay_p50_ns'] / 1000:.1f}us  p99 {total['original_p99_ns'] / 1000:.1f}us -> "
+            f"{total['replay_p99_ns'] / 1000:.1f}us"
+        )
+    for mismatch in report["mismatches"]:
+        lines.append(f"#{mismatch['index']} `{mismatch['line']}`: {mismatch['original']} -> {mismatch['replay']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m eggella.trace", description="Replay eggella session trace")
+    parser.add_argument("app", help="application import path: `module:attribute`")
+    parser.add_argument("trace", help="trace file path")
+    parser.add_argument("--pace", action="store_true", help="keep original delays between commands")
+    parser.add_argument("-o", "--output", help="write JSON report to this file")
+    args = parser.parse_args(argv)
+    sys.path.insert(0, os.getcwd())
+    report = TraceReplayer(load_app(args.app)).replay(args.trace, pace=args.pace)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(_format_report(report))
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Bounded tracebacks: console renderer with frames cap and rotating file for full tracebacks.
+prompt_toolkit is not imported: renderer returns `(style, text)` fragments"""
+import linecache
+import traceback
+from types import TracebackType
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+Fragments = List[Tuple[str, str]]
+# frame, line number or collapsed frames marker: (kind, count)
+_Entry = Union[Tuple[Any, int], Tuple[str, int]]
+
+STYLE_STACK = "class:exc_stack"
+STYLE_SIMILAR = "class:exc_similar"
+STYLE_ERROR = "ansired"
+
+_CAUSE = "\nThe above exception was the direct cause of the following exception:\n\n"
+_CONTEXT = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+
+def exceptions_chain(exc: BaseException, limit: int = 8) -> List[Tuple[BaseException, str]]:
+    """exception and its causes, oldest first, with joining message"""
+    chain: List[Tuple[BaseException, str]] = []
+    seen = set()
+    message = ""
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen and len(chain) < limit:
+        seen.add(id(current))
+        chain.append((current, message))
+        if current.__cause__ is not None:
+            current, message = current.__cause__, _CAUSE
+        elif current.__context__ is not None and not current.__suppress_context__:
+            current, message = current.__context__, _CONTEXT
+        else:
+            current = None
+    # message links exception with newer one: printed after exception traceback
+    chain.reverse()
+    return chain
+
+
+class TracebackRenderer:
+    """Render exception traceback with bounded frames count.
+
+    Repeated frames blocks (recursion, FSM states calls) are collapsed to one block
+    and `N similar frames` marker, then only `head` first and `tail` last frames are kept.
+    Source lines are read only for rendered frames
+
+    :param head: first frames count
+    :param tail: last frames count
+    :param max_period: longest repeated frames block size to detect
+    """
+
+    def __init__(self, head: int = 8, tail: int = 8, max_period: int = 4):
+        self.head = head
+        self.tail = tail
+        self.max_period = max_period
+
+    def _collapse_similar(self, frames: List[Tuple[Any, int]]) -> List[_Entry]:
+        keys = [(frame.f_code, lineno) for frame, lineno in frames]
+        entries: List[_Entry] = []
+        i, size = 0, len(keys)
+        while i < size:
+            for period in range(1, self.max_period + 1):
+                block = keys[i : i + period]
+                repeats = 1
+                while keys[i + repeats * period : i + (repeats + 1) * period] == block:
+                    repeats += 1
+                if repeats > 1:
+                    entries.extend(frames[i : i + period])
+                    entries.append(("similar", (repeats - 1) * period))
+                    i += repeats * period
+                    break
+            else:
+                entries.append(frames[i])
+                i += 1
+        return entries
+
+    def _cap(self, entries: List[_Entry]) -> List[_Entry]:
+        frames_idx = [i for i, entry in enumerate(entries) if not isinstance(entry[0], str)]
+        if len(frames_idx) <= self.head + self.tail:
+            return entries
+        start = frames_idx[self.head]
+        end = frames_idx[-self.tail] if self.tail else len(entries)
+        hidden = sum(entry[1] if isinstance(entry[0], str) else 1 for entry in entries[start:end])
+        return [*entries[:start], ("hidden", hidden), *entries[end:]]
+
+    def frames(self, tb: Optional[TracebackType]) -> List[_Entry]:
+        """walked traceback frames with collapsed similar and hidden frames markers"""
+        return self._cap(self._collapse_similar(list(traceback.walk_tb(tb))))
+
+    @staticmethod
+    def _frame_lines(frame: Any, lineno: int) -> Iterator[str]:
+        code = frame.f_code
+        yield f'  File "{code.co_filename}", line {lineno}, in {code.co_name}\n'
+        if line := linecache.getline(code.co_filename, lineno, frame.f_globals).strip():
+            yield f"    {line}\n"
+
+    def render(self, exc: BaseException) -> Fragments:
+        """exception chain traceback style fragments"""
+        fragments: Fragments = []
+        for error, joining in exceptions_chain(exc):
+            if error.__traceback__ is not None:
+                fragments.append((STYLE_ERROR, "Traceback (most recent call last):\n"))
+            for entry in self.frames(error.__traceback__):
+                if entry[0] == "similar":
+                    fragments.append((STYLE_SIMILAR, f"  [{entry[1]} similar frames]\n"))
+                elif entry[0] == "hidden":
+                    fragments.append((STYLE_SIMILAR, f"  [{entry[1]} frames hidden]\n"))
+                else:
+                    fragments.extend((STYLE_STACK, line) for line in self._frame_lines(*entry))
+            fragments.extend((STYLE_ERROR, line) for line in traceback.format_exception_only(type(error), error))
+            if joining:
+                fragments.append(("", joining))
+        return fragments
+
+    def render_text(self, exc: BaseException) -> str:
+        return "".join(text for _, text in self.render(exc))
+
+
+class TracebackLog:
+    """Rotating file for full, not bounded, commands tracebacks
+
+    :param path: log file path
+    :param max_bytes: rotate file after this size
+    :param backup_count: keep rotated files count
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 20, backup_count: int = 3):
+        import logging
+        from logging.handlers import RotatingFileHandler
+
+        self.path = path
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        # not registered in logging manager: records are not propagated to application loggers
+        self._logger = logging.Logger("eggella.tracebacks", logging.ERROR)
+        self._logger.addHandler(self._handler)
+
+    def write(self, key: str, args: str, exc: BaseException):
+        self._logger.error("command `%s` with args: %s", key, args, exc_info=(type(exc), exc, exc.__traceback__))
+
+    def close(self):
+        self._handler.close()
@@ -61,12 +61,12 @@ def raise_err2():
     raise ConnectionError("connect error - dummy_handle_exc catch this")
 
 
-@dummy_handle_exc  # decorators stack not work
+@dummy_handle_exc  # handlers stack: exceptions of both handlers are caught
 @my_error_handler
 @app.on_command("raise-err3")
 def raise_err3():
-    """raise TypeError and close app"""
-    raise ConnectionError("connect error - dummy_handle_exc not catch this :(")
+    """raise ConnectionError and catch exception"""
+    raise ConnectionError("connect error - dummy_handle_exc catch this")
 
 
 if __name__ == '__main__':
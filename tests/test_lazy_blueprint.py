@@ -0,0 +1,59 @@
+import textwrap
+
+import pytest
+
+from eggella import Eggella
+from eggella.blueprint import LazyBlueprint
+from eggella.exceptions import CommandNotFoundError, CommandRuntimeError
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """write blueprint modules to importable directory"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(name: str, source: str):
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+
+    return write
+
+
+def test_broken_blueprint_module_is_runtime_error(modules):
+    modules("broken_bp", "import not_existing_eggella_module\n")
+    app = Eggella("test-broken-bp")
+    app.register_blueprint(LazyBlueprint("broken_bp:app", manifest={"hello": "say hello"}))
+    app._prepare()
+
+    with pytest.raises(CommandRuntimeError) as exc_info:
+        app.command_manager.exec("hello", "")
+    assert isinstance(exc_info.value.__cause__, ImportError)
+
+    # REPL loop is not stopped: both lines reach runtime error event
+    result = app.driver().run("hello", "hello")
+    assert result.event_names().count("command_runtime_err_event") == 2
+
+
+def test_stale_manifest_key_is_command_not_found(modules):
+    modules(
+        "stale_bp",
+        """
+        from eggella import Eggella
+
+        app = Eggella("stale_bp")
+
+
+        @app.on_command()
+        def real():
+            return "real"
+        """,
+    )
+    app = Eggella("test-stale-bp")
+    app.register_blueprint(LazyBlueprint("stale_bp:app", manifest={"gone": "removed command", "real": "real"}))
+    app._prepare()
+
+    with pytest.raises(CommandNotFoundError):
+        app.command_manager.exec("gone", "")
+    assert app.command_manager.exec("real", "") == "real"
+
+    result = app.driver().run("gone")
+    assert "command_not_found_event" in result.event_names()